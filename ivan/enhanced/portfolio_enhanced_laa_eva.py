@@ -3,7 +3,9 @@ Enhanced LAA-EVA System with Comprehensive Portfolio Management
 Includes position sizing, drawdown limits, and detailed trade logging
 """
 
+import os
 import json
+import heapq
 import uuid
 import logging
 import pandas as pd
@@ -15,13 +17,21 @@ from itertools import product
 import random
 from enum import Enum
 
+try:
+    from numba import njit, prange
+except ImportError:  # numba is optional; indicators fall back to pandas
+    njit = None
+    prange = range
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+NS_PER_DAY = 24 * 60 * 60 * 10**9
+
 
 # ==================== PORTFOLIO CONFIGURATION ====================
-@dataclass
+@dataclass(slots=True)
 class PortfolioConfig:
     """Configuration for portfolio management"""
     initial_capital_eth: float = 10.0           # Starting portfolio in ETH
@@ -31,7 +41,7 @@ class PortfolioConfig:
     recovery_threshold_pct: float = 75.0        # Resume trading at this recovery
     reserve_capital_pct: float = 20.0          # Keep as reserve
     compound_profits: bool = True               # Reinvest profits
-    position_sizing_mode: str = "fixed"         # fixed, kelly, or risk_adjusted
+    position_sizing_mode: str = "fixed"         # fixed or kelly (other modes size as fixed)
 
     # Signal-based position sizing multipliers
     position_multipliers: Dict[int, float] = field(default_factory=lambda: {
@@ -45,15 +55,49 @@ class PortfolioConfig:
     max_position_risk_pct: float = 2.0         # Max risk per position (% of portfolio)
     daily_loss_limit_pct: float = 10.0         # Max daily loss
 
+    # Kelly sizing inputs, e.g. taken from a previous backtest's statistics
+    kelly_win_rate: float = 0.5                # Fraction of trades that win
+    kelly_win_loss_ratio: float = 1.0          # Average win / average loss
+    kelly_fraction: float = 0.5                # Share of the full Kelly bet to take (0.5 = half Kelly)
+
+    def __post_init__(self):
+        self._check_kelly_inputs()  # reject bad Kelly inputs at construction, not on the first trade
+
+    def _check_kelly_inputs(self):
+        if not 0 <= self.kelly_win_rate <= 1:
+            raise ValueError(f"kelly_win_rate must be between 0 and 1, got {self.kelly_win_rate}")
+        if not self.kelly_win_loss_ratio > 0:
+            raise ValueError(f"kelly_win_loss_ratio must be positive, got {self.kelly_win_loss_ratio}")
+        if not 0 <= self.kelly_fraction <= 1:
+            raise ValueError(f"kelly_fraction must be between 0 and 1, got {self.kelly_fraction}")
+
+    def _kelly_size_frac(self) -> float:
+        self._check_kelly_inputs()
+        # Kelly bet k = W - (1 - W) / R; a negative edge means no position
+        kelly = self.kelly_win_rate - (1 - self.kelly_win_rate) / self.kelly_win_loss_ratio
+        return max(0.0, kelly) * self.kelly_fraction
+
+    @property
+    def base_size_frac(self) -> float:
+        """Fraction of portfolio value per position, before the signal multiplier"""
+        if self.position_sizing_mode == "kelly":
+            return self._kelly_size_frac()
+        return self.position_size_pct / 100
+
+    @property
+    def available_frac(self) -> float:
+        """Fraction of portfolio value left for positions after the reserve"""
+        return 1 - self.reserve_capital_pct / 100
+
     def get_position_size(self, portfolio_value: float, signal_strength: int) -> float:
         """Calculate position size based on portfolio value and signal strength"""
-        base_size = portfolio_value * (self.position_size_pct / 100)
+        base_size = portfolio_value * self.base_size_frac
 
         # Apply signal strength multiplier
         multiplier = self.position_multipliers.get(abs(signal_strength), 1.0)
 
         # Apply reserve capital constraint
-        available_capital = portfolio_value * (1 - self.reserve_capital_pct / 100)
+        available_capital = portfolio_value * self.available_frac
 
         position_size = min(base_size * multiplier, available_capital)
 
@@ -96,7 +140,7 @@ class OptionInstruments:
 
 
 # ==================== ENHANCED TRADE LOG ====================
-@dataclass
+@dataclass(slots=True)
 class TradeLog:
     """Detailed trade information"""
     trade_id: str
@@ -147,7 +191,7 @@ class TradeLog:
 
 
 # ==================== ENHANCED OPTIONS SIGNAL ====================
-@dataclass
+@dataclass(slots=True)
 class EnhancedOptionsSignal:
     """Enhanced options trading signal"""
     strategy_id: uuid.UUID
@@ -167,12 +211,20 @@ class EnhancedOptionsSignal:
 class PortfolioManager:
     """Manages portfolio state and risk limits"""
 
+    __slots__ = ('config', 'capital_eth', 'peak_capital', 'active_positions', 'trade_logs', '_open_trade_logs',
+                 '_expiry_heap', '_open_seq', 'is_trading_enabled', 'daily_loss', 'last_trading_day')
+
     def __init__(self, config: PortfolioConfig):
         self.config = config
         self.capital_eth = config.initial_capital_eth
         self.peak_capital = config.initial_capital_eth
-        self.active_positions: List[Dict[str, Any]] = []
+        self.active_positions: Dict[str, Dict[str, Any]] = {}  # keyed by trade_id, in opening order
         self.trade_logs: List[TradeLog] = []
+        self._open_trade_logs: Dict[str, TradeLog] = {}
+
+        # Open positions as (expiry_ns, open_seq, position), earliest expiry first
+        self._expiry_heap: List[Tuple[int, int, Dict[str, Any]]] = []
+        self._open_seq = 0
         self.is_trading_enabled = True
         self.daily_loss = 0
         self.last_trading_day = None
@@ -183,11 +235,6 @@ class PortfolioManager:
             return ((self.peak_capital - self.capital_eth) / self.peak_capital) * 100
         return 0
 
-    def update_peak(self):
-        """Update peak capital for drawdown calculation"""
-        if self.capital_eth > self.peak_capital:
-            self.peak_capital = self.capital_eth
-
     def check_trading_enabled(self) -> bool:
         """Check if trading should be enabled based on risk limits"""
         current_drawdown = self.calculate_drawdown()
@@ -223,7 +270,7 @@ class PortfolioManager:
         position_size = self.config.get_position_size(self.capital_eth, signal_strength)
 
         # Check if we have enough available capital
-        invested_capital = sum(pos['size_eth'] for pos in self.active_positions)
+        invested_capital = sum(pos['size_eth'] for pos in self.active_positions.values())
         available_capital = self.capital_eth - invested_capital
 
         if position_size > available_capital:
@@ -242,7 +289,9 @@ class PortfolioManager:
             logger.debug(f"Cannot open position: {reason}")
             return None
 
-        trade_id = str(uuid.uuid4())[:8]
+        # Sequential ids are unique within this manager's run, which is all trade logs need
+        self._open_seq += 1
+        trade_id = f"T{self._open_seq:07d}"
 
         # Calculate premium cost
         premium_cost_eth = position_size * (signal.premium_cost_pct / 100)
@@ -261,7 +310,9 @@ class PortfolioManager:
             'premium_paid_eth': premium_cost_eth
         }
 
-        self.active_positions.append(position)
+        self.active_positions[trade_id] = position
+        expiry_ns = pd.Timestamp(signal.timestamp).value + signal.duration_days * NS_PER_DAY
+        heapq.heappush(self._expiry_heap, (expiry_ns, self._open_seq, position))
 
         # Deduct premium immediately
         self.capital_eth -= premium_cost_eth
@@ -291,12 +342,23 @@ class PortfolioManager:
         )
 
         self.trade_logs.append(trade_log)
+        self._open_trade_logs[trade_id] = trade_log
 
         logger.info(f"Opened position {trade_id}: {position_size:.3f} ETH, "
                    f"{signal.instrument_type}, Signal: {signal.signal}")
 
         return trade_id
 
+    def pop_expired(self, current_ns: int) -> List[Dict[str, Any]]:
+        """Positions held for their full duration at current_ns (datetime64[ns] ticks), in opening order"""
+        heap = self._expiry_heap
+        expired = []
+        while heap and heap[0][0] <= current_ns:
+            expired.append(heapq.heappop(heap))
+
+        expired.sort(key=lambda entry: entry[1])
+        return [position for _, _, position in expired]
+
     def close_position(self, position: Dict, exit_price: float, exit_time: datetime,
                        exit_reason: str = "expiry") -> float:
         """Close a position and return P&L"""
@@ -314,25 +376,24 @@ class PortfolioManager:
         # Calculate P&L in ETH (premium already paid)
         pnl_eth = position['size_eth'] * capped_pnl
 
-        # Update capital
+        # Update capital and the peak it is measured against
         self.capital_eth += pnl_eth
-        self.update_peak()
+        if self.capital_eth > self.peak_capital:
+            self.peak_capital = self.capital_eth
 
         # Update trade log
-        for trade_log in self.trade_logs:
-            if trade_log.trade_id == position['trade_id']:
-                trade_log.exit_time = exit_time
-                trade_log.exit_price = exit_price
-                trade_log.pnl_eth = pnl_eth - position['premium_paid_eth']  # Net P&L
-                trade_log.pnl_pct = ((pnl_eth - position['premium_paid_eth']) / position['size_eth']) * 100
-                trade_log.capital_after = self.capital_eth
-                trade_log.portfolio_pct_after = (self.capital_eth / self.config.initial_capital_eth) * 100
-                trade_log.win = trade_log.pnl_eth > 0
-                trade_log.exit_reason = exit_reason
-                break
+        trade_log = self._open_trade_logs.pop(position['trade_id'])
+        trade_log.exit_time = exit_time
+        trade_log.exit_price = exit_price
+        trade_log.pnl_eth = pnl_eth - position['premium_paid_eth']  # Net P&L
+        trade_log.pnl_pct = ((pnl_eth - position['premium_paid_eth']) / position['size_eth']) * 100
+        trade_log.capital_after = self.capital_eth
+        trade_log.portfolio_pct_after = (self.capital_eth / self.config.initial_capital_eth) * 100
+        trade_log.win = trade_log.pnl_eth > 0
+        trade_log.exit_reason = exit_reason
 
         # Remove from active positions
-        self.active_positions.remove(position)
+        del self.active_positions[position['trade_id']]
 
         net_pnl = pnl_eth - position['premium_paid_eth']
         logger.info(f"Closed position {position['trade_id']}: Net P&L: {net_pnl:.4f} ETH, "
@@ -341,6 +402,295 @@ class PortfolioManager:
         return net_pnl
 
 
+# ==================== NUMBA KERNELS ====================
+# Compiled kernels are cached on disk (__pycache__) so only the first process after an edit pays the
+# compile. Cached code re-imports this module by the name it was compiled under, so caching is limited
+# to imports under the module's own name (the command line goes through that import too); a load under
+# any other name compiles in memory instead of reading entries it could not rebuild.
+CACHE_KERNELS = __name__ == os.path.splitext(os.path.basename(__file__))[0]
+
+def _jit(func):
+    """Compile a kernel with numba, or return None so callers use the pandas path"""
+    if njit is None:
+        return None
+    return njit(error_model='numpy', cache=CACHE_KERNELS)(func)
+
+
+def _jit_parallel(func):
+    """_jit with parallel=True, so prange loops are spread across threads"""
+    if njit is None:
+        return None
+    return njit(error_model='numpy', parallel=True, cache=CACHE_KERNELS)(func)
+
+
+@_jit
+def _rolling_mean_nb(values, window):
+    """Fixed-window mean matching pandas rolling().mean(): Kahan-compensated running sum"""
+    n = values.shape[0]
+    out = np.full(n, np.nan)
+    sum_x = 0.0
+    comp_add = 0.0
+    comp_remove = 0.0
+    nobs = 0
+    neg_ct = 0
+    prev_value = np.nan
+    same_ct = 0
+
+    for i in range(n):
+        if i >= window:
+            val = values[i - window]
+            if val == val:
+                nobs -= 1
+                y = -val - comp_remove
+                t = sum_x + y
+                comp_remove = t - sum_x - y
+                sum_x = t
+                if val < 0:
+                    neg_ct -= 1
+
+        val = values[i]
+        if val == val:
+            nobs += 1
+            y = val - comp_add
+            t = sum_x + y
+            comp_add = t - sum_x - y
+            sum_x = t
+            if val < 0:
+                neg_ct += 1
+            if val == prev_value:
+                same_ct += 1
+            else:
+                same_ct = 1
+            prev_value = val
+
+        if nobs >= window:
+            if same_ct >= nobs:
+                out[i] = prev_value
+            else:
+                result = sum_x / nobs
+                if neg_ct == 0 and result < 0:
+                    result = 0.0
+                out[i] = result
+    return out
+
+
+@_jit
+def _ewm_mean_nb(values, alpha):
+    """ewm(adjust=False).mean() with smoothing factor alpha, following pandas' recurrence (NaNs included)"""
+    n = values.shape[0]
+    out = np.empty(n)
+    if n == 0:
+        return out
+
+    old_wt_factor = 1.0 - alpha
+    old_wt = 1.0
+    new_wt = alpha
+    weighted = values[0]
+    out[0] = weighted
+    for i in range(1, n):
+        cur = values[i]
+        is_observation = cur == cur
+        if weighted == weighted:
+            # A missing value still decays the weight of the running average
+            old_wt *= old_wt_factor
+            if alpha == 0.5:
+                # pandas renormalizes the new weight for com == 1 (span 3)
+                new_wt = 1.0 - old_wt
+            if is_observation:
+                if weighted != cur:
+                    weighted = (old_wt * weighted + new_wt * cur) / (old_wt + new_wt)
+                old_wt = 1.0
+        elif is_observation:
+            weighted = cur
+        out[i] = weighted
+    return out
+
+
+def _span_alpha(span: float) -> float:
+    """Smoothing factor pandas derives from ewm(span=...)"""
+    com = (span - 1) / 2.0
+    return 1.0 / (1.0 + com)
+
+
+# Condition opcodes and rule group modes for the compiled DSL
+OP_NEVER, OP_GT, OP_LT, OP_GE, OP_LE, OP_EQ, OP_NE, OP_CROSS_ABOVE, OP_CROSS_BELOW = 0, 1, 2, 3, 4, 5, 6, 7, 8
+GROUP_NEVER, GROUP_AND, GROUP_OR = 0, 1, 2
+
+# '==' / '!=' tolerance, np.isclose's defaults: |a - b| <= EQ_ATOL + EQ_RTOL * |b|. Compared as
+# |a - b| - EQ_RTOL * |b| <= EQ_ATOL so an infinite b turns the test into NaN (not close) like isclose.
+EQ_RTOL, EQ_ATOL = 1e-5, 1e-8
+
+OPCODES = {
+    '>': OP_GT, '<': OP_LT, '>=': OP_GE, '<=': OP_LE, '==': OP_EQ, '!=': OP_NE,
+    'crosses_above': OP_CROSS_ABOVE, 'crosses_below': OP_CROSS_BELOW,
+}
+
+
+@_jit
+def _match_rules_nb(values, consts, cond_table, rule_starts, rule_modes):
+    """
+    Index of the first matching rule on each bar (-1 when none), with the same condition semantics as
+    the mask path. Operand refs >= 0 are value columns, negative refs are consts[-1 - ref].
+    """
+    n = values.shape[0]
+    n_rules = rule_modes.shape[0]
+    out = np.full(n, -1, dtype=np.int64)
+    for i in range(n):
+        for r in range(n_rules):
+            mode = rule_modes[r]
+            start = rule_starts[r]
+            end = rule_starts[r + 1]
+            if mode == GROUP_NEVER or start == end:
+                continue
+
+            matched = mode == GROUP_AND
+            for c in range(start, end):
+                op = cond_table[c, 0]
+                lhs = cond_table[c, 1]
+                rhs = cond_table[c, 2]
+                v1 = consts[-1 - lhs] if lhs < 0 else values[i, lhs]
+                v2 = consts[-1 - rhs] if rhs < 0 else values[i, rhs]
+
+                hit = False
+                if np.isnan(v1) or np.isnan(v2):
+                    hit = False
+                elif op == OP_GT:
+                    hit = v1 > v2
+                elif op == OP_LT:
+                    hit = v1 < v2
+                elif op == OP_GE:
+                    hit = v1 >= v2
+                elif op == OP_LE:
+                    hit = v1 <= v2
+                elif op == OP_EQ or op == OP_NE:
+                    close = v1 == v2 or abs(v1 - v2) - EQ_RTOL * abs(v2) <= EQ_ATOL
+                    hit = close if op == OP_EQ else not close
+                elif op == OP_CROSS_ABOVE or op == OP_CROSS_BELOW:
+                    p1 = consts[-1 - lhs] if lhs < 0 else (values[i - 1, lhs] if i > 0 else np.nan)
+                    p2 = consts[-1 - rhs] if rhs < 0 else (values[i - 1, rhs] if i > 0 else np.nan)
+                    if np.isnan(p1) or np.isnan(p2):
+                        hit = False
+                    elif op == OP_CROSS_ABOVE:
+                        hit = p1 <= p2 and v1 > v2
+                    else:
+                        hit = p1 >= p2 and v1 < v2
+
+                if mode == GROUP_AND and not hit:
+                    matched = False
+                    break
+                if mode == GROUP_OR and hit:
+                    matched = True
+                    break
+            if matched:
+                out[i] = r
+                break
+    return out
+
+
+# PortfolioConfig fields passed to _sweep_portfolio_nb as float64 columns, in order
+SWEEP_PARAMS = ('initial_capital_eth', 'base_size_frac', 'available_frac', 'max_drawdown_pct',
+                'recovery_threshold_pct')
+
+
+@_jit
+def _simulate_portfolio_nb(bar_ns, close, bar_signal, sig_strength, sig_profit_cap, sig_premium,
+                           sig_duration_ns, multipliers, initial_capital, base_size_frac, available_frac,
+                           max_concurrent, max_drawdown_pct, recovery_threshold_pct):
+    """
+    PortfolioManager's expiry / open / close state machine for one config, without trade logs.
+    bar_signal is the signal index on each bar (-1 for none); sig_profit_cap and sig_premium are fractions.
+    Returns (final capital, closed trades, max per-bar drawdown %).
+    """
+    n_signals = sig_strength.shape[0]
+    # Open positions, kept in opening order
+    pos_expiry = np.empty(n_signals, dtype=np.int64)
+    pos_entry = np.empty(n_signals)
+    pos_strength = np.empty(n_signals, dtype=np.int64)
+    pos_profit_cap = np.empty(n_signals)
+    pos_size = np.empty(n_signals)
+    n_active = 0
+
+    capital = initial_capital
+    peak = initial_capital
+    trading_enabled = True
+    n_trades = 0
+    max_drawdown = 0.0
+
+    for i in range(bar_ns.shape[0]):
+        price = close[i]
+
+        # Close positions that reached expiry
+        kept = 0
+        for k in range(n_active):
+            if pos_expiry[k] <= bar_ns[i]:
+                price_change = (price - pos_entry[k]) / pos_entry[k]
+                raw_pnl = price_change if pos_strength[k] > 0 else -price_change
+                if not raw_pnl > 0:
+                    raw_pnl = 0.0
+                capped_pnl = pos_profit_cap[k] if pos_profit_cap[k] < raw_pnl else raw_pnl
+                capital += pos_size[k] * capped_pnl
+                if capital > peak:
+                    peak = capital
+                n_trades += 1
+            else:
+                pos_expiry[kept] = pos_expiry[k]
+                pos_entry[kept] = pos_entry[k]
+                pos_strength[kept] = pos_strength[k]
+                pos_profit_cap[kept] = pos_profit_cap[k]
+                pos_size[kept] = pos_size[k]
+                kept += 1
+        n_active = kept
+
+        # Open a position on the bar's signal, under the same limits as can_open_position
+        s = bar_signal[i]
+        if s >= 0 and sig_strength[s] != 0:
+            drawdown = ((peak - capital) / peak) * 100 if peak > 0 else 0.0
+            if drawdown >= max_drawdown_pct:
+                trading_enabled = False
+            else:
+                if not trading_enabled and capital >= peak * (recovery_threshold_pct / 100):
+                    trading_enabled = True
+                if trading_enabled and n_active < max_concurrent:
+                    sized = capital * base_size_frac * multipliers[s]
+                    reserve_cap = capital * available_frac
+                    position_size = reserve_cap if reserve_cap < sized else sized
+                    invested = 0.0
+                    for k in range(n_active):
+                        invested += pos_size[k]
+                    if position_size > capital - invested:
+                        position_size = capital - invested
+                    if not position_size <= 0:
+                        pos_expiry[n_active] = bar_ns[i] + sig_duration_ns[s]
+                        pos_entry[n_active] = price
+                        pos_strength[n_active] = sig_strength[s]
+                        pos_profit_cap[n_active] = sig_profit_cap[s]
+                        pos_size[n_active] = position_size
+                        n_active += 1
+                        capital -= position_size * sig_premium[s]
+
+        drawdown = ((peak - capital) / peak) * 100 if peak > 0 else 0.0
+        if i == 0 or drawdown > max_drawdown:
+            max_drawdown = drawdown
+
+    return capital, n_trades, max_drawdown
+
+
+@_jit_parallel
+def _sweep_portfolio_nb(bar_ns, close, bar_signal, sig_strength, sig_profit_cap, sig_premium,
+                        sig_duration_ns, multipliers, params, max_concurrent):
+    """_simulate_portfolio_nb for every config row in parallel; params columns follow SWEEP_PARAMS"""
+    n_configs = params.shape[0]
+    final_capital = np.empty(n_configs)
+    n_trades = np.empty(n_configs, dtype=np.int64)
+    max_drawdown = np.empty(n_configs)
+    for c in prange(n_configs):
+        final_capital[c], n_trades[c], max_drawdown[c] = _simulate_portfolio_nb(
+            bar_ns, close, bar_signal, sig_strength, sig_profit_cap, sig_premium, sig_duration_ns,
+            multipliers[c], params[c, 0], params[c, 1], params[c, 2], max_concurrent[c],
+            params[c, 3], params[c, 4])
+    return final_capital, n_trades, max_drawdown
+
+
 # ==================== TECHNICAL INDICATORS ====================
 class TechnicalIndicators:
     """Manual implementation of technical indicators"""
@@ -351,10 +701,23 @@ class TechnicalIndicators:
 
     @staticmethod
     def ema(series: pd.Series, period: int) -> pd.Series:
+        if _ewm_mean_nb is not None and period >= 1:
+            ema = _ewm_mean_nb(series.to_numpy(dtype=np.float64), _span_alpha(period))
+            return pd.Series(ema, index=series.index, name=series.name)
         return series.ewm(span=period, adjust=False).mean()
 
     @staticmethod
     def rsi(series: pd.Series, period: int = 14) -> pd.Series:
+        if _rolling_mean_nb is not None and isinstance(period, (int, np.integer)) and period >= 1:
+            close = series.to_numpy(dtype=np.float64)
+            delta = np.zeros_like(close)
+            delta[1:] = close[1:] - close[:-1]
+            gain = _rolling_mean_nb(np.where(delta > 0, delta, 0.0), period)
+            loss = _rolling_mean_nb(np.where(delta < 0, -delta, 0.0), period)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                rsi = 100 - (100 / (1 + gain / loss))
+            return pd.Series(rsi, index=series.index)
+
         delta = series.diff()
         gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
         loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
@@ -364,10 +727,10 @@ class TechnicalIndicators:
 
     @staticmethod
     def macd(series: pd.Series, fast: int = 12, slow: int = 26, signal: int = 9) -> pd.DataFrame:
-        ema_fast = series.ewm(span=fast, adjust=False).mean()
-        ema_slow = series.ewm(span=slow, adjust=False).mean()
+        ema_fast = TechnicalIndicators.ema(series, fast)
+        ema_slow = TechnicalIndicators.ema(series, slow)
         macd_line = ema_fast - ema_slow
-        signal_line = macd_line.ewm(span=signal, adjust=False).mean()
+        signal_line = TechnicalIndicators.ema(macd_line, signal)
         histogram = macd_line - signal_line
 
         return pd.DataFrame({
@@ -378,24 +741,45 @@ class TechnicalIndicators:
 
     @staticmethod
     def atr(high: pd.Series, low: pd.Series, close: pd.Series, period: int = 14) -> pd.Series:
-        high_low = high - low
-        high_close = (high - close.shift()).abs()
-        low_close = (low - close.shift()).abs()
-        true_range = pd.concat([high_low, high_close, low_close], axis=1).max(axis=1)
-        atr = true_range.rolling(window=period).mean()
+        h = high.to_numpy(dtype=np.float64)
+        l = low.to_numpy(dtype=np.float64)
+        c = close.to_numpy(dtype=np.float64)
+        prev_c = np.empty_like(c)
+        prev_c[:1] = np.nan
+        prev_c[1:] = c[:-1]
+
+        # fmax skips the NaN previous close on the first bar, like DataFrame.max
+        true_range = np.fmax.reduce([h - l, np.abs(h - prev_c), np.abs(l - prev_c)])
+        if _rolling_mean_nb is not None and isinstance(period, (int, np.integer)) and period >= 1:
+            return pd.Series(_rolling_mean_nb(true_range, period), index=close.index)
+        atr = pd.Series(true_range, index=close.index).rolling(window=period).mean()
         return atr
 
     @staticmethod
     def expected_move(close: pd.Series, atr: pd.Series, rsi: pd.Series,
                      macd_hist: pd.Series) -> pd.Series:
-        rsi_momentum = (rsi - 50) / 50
-        macd_momentum = np.tanh(macd_hist / close * 100)
-        momentum_factor = (rsi_momentum + macd_momentum) / 2
-        expected_move_pct = (atr / close) * 100 * (1 + momentum_factor)
-        return expected_move_pct
+        # Same-index inputs, so the formula runs on raw arrays without pandas alignment
+        c = close.to_numpy(dtype=np.float64)
+        a = atr.to_numpy(dtype=np.float64)
+        r = rsi.to_numpy(dtype=np.float64)
+        m = macd_hist.to_numpy(dtype=np.float64)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            momentum_factor = ((r - 50) / 50 + np.tanh(m / c * 100)) / 2
+            expected_move_pct = (a / c) * 100 * (1 + momentum_factor)
+        return pd.Series(expected_move_pct, index=close.index)
 
 
 # ==================== DSL EXECUTOR ====================
+@dataclass
+class CompiledRules:
+    """Signal rules translated into flat tables for _match_rules_nb"""
+    columns: List[str]          # column names behind column refs, in matrix order
+    consts: np.ndarray          # float64 constants behind negative refs
+    cond_table: np.ndarray      # int64 (n_conditions, 3): opcode, lhs ref, rhs ref
+    rule_starts: np.ndarray     # int64 (n_rules + 1): condition range of each rule
+    rule_modes: np.ndarray      # int64 (n_rules,): GROUP_AND / GROUP_OR / GROUP_NEVER
+
+
 class PortfolioAwareDslExecutor:
     """DSL Executor that works with PortfolioManager"""
 
@@ -406,8 +790,40 @@ class PortfolioAwareDslExecutor:
         self.indicator_outputs = {}
         self.indicators = TechnicalIndicators()
         self.option_instruments = OptionInstruments()
+        self._rules = self.dsl.get('signal_rules', [])
+        self._compiled = self._compile_dsl()
         logger.info(f"PortfolioAwareDslExecutor initialized for strategy {strategy_id}")
 
+    def _compile_dsl(self) -> CompiledRules:
+        """Translate the signal rules into opcode tables once; constants are resolved here"""
+        columns: List[str] = []
+        consts: List[float] = []
+
+        def ref(series_or_value: Any) -> int:
+            if isinstance(series_or_value, str) and not series_or_value.startswith('@'):
+                if series_or_value not in columns:
+                    columns.append(series_or_value)
+                return columns.index(series_or_value)
+            consts.append(float(np.asarray(self._resolve_value(series_or_value), dtype=np.float64)))
+            return -len(consts)
+
+        cond_rows, rule_starts, rule_modes = [], [0], []
+        for rule in self._rules:
+            group = rule['conditions_group']
+            rule_modes.append({'AND': GROUP_AND, 'OR': GROUP_OR}.get(group['operator'].upper(), GROUP_NEVER))
+            for condition in group['conditions']:
+                cond_rows.append((OPCODES.get(condition['operator'].lower(), OP_NEVER),
+                                  ref(condition['series1']), ref(condition['series2_or_value'])))
+            rule_starts.append(len(cond_rows))
+
+        return CompiledRules(
+            columns=columns,
+            consts=np.array(consts, dtype=np.float64),
+            cond_table=np.array(cond_rows, dtype=np.int64).reshape(-1, 3),
+            rule_starts=np.array(rule_starts, dtype=np.int64),
+            rule_modes=np.array(rule_modes, dtype=np.int64),
+        )
+
     def _resolve_value(self, value_or_ref: Any) -> Any:
         if isinstance(value_or_ref, str) and value_or_ref.startswith("@"):
             const_name = value_or_ref[1:]
@@ -417,8 +833,9 @@ class PortfolioAwareDslExecutor:
                 raise ValueError(f"Undefined constant: {value_or_ref}")
         return value_or_ref
 
-    def _calculate_indicators(self, df: pd.DataFrame) -> pd.DataFrame:
-        df_with_indicators = df.copy()
+    def _calculate_indicators(self, df: Dict[str, pd.Series], index: pd.Index) -> Dict[str, pd.Series]:
+        """The input columns plus every indicator output, by name; no frame is copied or built"""
+        df_with_indicators = dict(df)
 
         for indicator in self.dsl.get('indicators', []):
             indicator_type = indicator['type'].lower()
@@ -474,10 +891,10 @@ class PortfolioAwareDslExecutor:
             except Exception as e:
                 logger.warning(f"Error calculating {indicator_type}: {e}")
                 primary_col = outputs['primary_output_column']
-                df_with_indicators[primary_col] = np.nan
+                df_with_indicators[primary_col] = pd.Series(np.nan, index=index)
 
         # Calculate expected move
-        if 'rsi_value' in df_with_indicators.columns and 'macd_hist' in df_with_indicators.columns and 'atr_value' in df_with_indicators.columns:
+        if 'rsi_value' in df_with_indicators and 'macd_hist' in df_with_indicators and 'atr_value' in df_with_indicators:
             df_with_indicators['expected_move_pct'] = self.indicators.expected_move(
                 df['close'],
                 df_with_indicators['atr_value'],
@@ -485,86 +902,103 @@ class PortfolioAwareDslExecutor:
                 df_with_indicators['macd_hist']
             )
         else:
-            if 'atr_value' in df_with_indicators.columns:
+            if 'atr_value' in df_with_indicators:
                 df_with_indicators['expected_move_pct'] = (df_with_indicators['atr_value'] / df['close']) * 100
             else:
-                df_with_indicators['expected_move_pct'] = 2.0
+                df_with_indicators['expected_move_pct'] = pd.Series(2.0, index=index)
 
         return df_with_indicators
 
-    def _evaluate_condition(self, condition: Dict[str, Any], row: pd.Series,
-                           df: pd.DataFrame, idx: int) -> bool:
+    def _evaluate_condition(self, condition: Dict[str, Any], arrays: Dict[str, np.ndarray],
+                            prev_arrays: Dict[str, np.ndarray]) -> np.ndarray:
+        """Per-bar bool mask of a condition over whole column arrays"""
         series1 = condition['series1']
         operator = condition['operator'].lower()
         series2_or_value = condition['series2_or_value']
 
-        val1 = self._get_value(series1, row)
-        val2 = self._get_value(series2_or_value, row)
+        val1 = self._get_array(series1, arrays)
+        val2 = self._get_array(series2_or_value, arrays)
 
-        if pd.isna(val1) or pd.isna(val2):
-            return False
+        # Missing values never satisfy a condition
+        valid = ~np.isnan(val1) & ~np.isnan(val2)
 
         if operator == '>':
-            return val1 > val2
+            result = val1 > val2
         elif operator == '<':
-            return val1 < val2
+            result = val1 < val2
         elif operator == '>=':
-            return val1 >= val2
+            result = val1 >= val2
         elif operator == '<=':
-            return val1 <= val2
+            result = val1 <= val2
         elif operator == '==':
-            return np.isclose(val1, val2)
+            result = np.isclose(val1, val2)
         elif operator == '!=':
-            return not np.isclose(val1, val2)
+            result = ~np.isclose(val1, val2)
         elif operator in ['crosses_above', 'crosses_below']:
-            if idx < 1:
-                return False
-            prev_row = df.iloc[idx - 1]
-            prev_val1 = self._get_value(series1, prev_row)
-            prev_val2 = self._get_value(series2_or_value, prev_row)
-
-            if pd.isna(prev_val1) or pd.isna(prev_val2):
-                return False
+            prev_val1 = self._get_prev_array(series1, arrays, prev_arrays)
+            prev_val2 = self._get_prev_array(series2_or_value, arrays, prev_arrays)
+            valid = valid & ~np.isnan(prev_val1) & ~np.isnan(prev_val2)
 
             if operator == 'crosses_above':
-                return prev_val1 <= prev_val2 and val1 > val2
-            elif operator == 'crosses_below':
-                return prev_val1 >= prev_val2 and val1 < val2
+                result = (prev_val1 <= prev_val2) & (val1 > val2)
+            else:
+                result = (prev_val1 >= prev_val2) & (val1 < val2)
+        else:
+            result = np.asarray(False)
 
-        return False
+        return valid & result
 
-    def _get_value(self, series_or_value: Any, row: pd.Series) -> Any:
+    def _get_array(self, series_or_value: Any, arrays: Dict[str, np.ndarray]) -> np.ndarray:
+        """Column array, or a scalar array for constants, literals and missing columns (NaN)"""
         if isinstance(series_or_value, str):
             if series_or_value.startswith('@'):
-                return self._resolve_value(series_or_value)
-            elif series_or_value in row.index:
-                return row[series_or_value]
+                return np.asarray(self._resolve_value(series_or_value), dtype=np.float64)
+            elif series_or_value in arrays:
+                return arrays[series_or_value]
             else:
-                return np.nan
+                return np.asarray(np.nan)
         else:
-            return series_or_value
-
-    def _evaluate_condition_group(self, group: Dict[str, Any], row: pd.Series,
-                                 df: pd.DataFrame, idx: int) -> bool:
+            return np.asarray(series_or_value, dtype=np.float64)
+
+    def _get_prev_array(self, series_or_value: Any, arrays: Dict[str, np.ndarray],
+                        prev_arrays: Dict[str, np.ndarray]) -> np.ndarray:
+        """Previous-bar values (NaN on the first bar), shifted once per column and shared across conditions"""
+        if isinstance(series_or_value, str) and series_or_value in arrays:
+            if series_or_value not in prev_arrays:
+                values = arrays[series_or_value]
+                prev = np.empty_like(values)
+                prev[:1] = np.nan
+                prev[1:] = values[:-1]
+                prev_arrays[series_or_value] = prev
+            return prev_arrays[series_or_value]
+        # Constants and literals are the same on every bar
+        return self._get_array(series_or_value, arrays)
+
+    def _evaluate_condition_group(self, group: Dict[str, Any], arrays: Dict[str, np.ndarray],
+                                  prev_arrays: Dict[str, np.ndarray], n_bars: int) -> np.ndarray:
+        """Per-bar bool mask of an AND/OR condition group; empty groups and other operators never match"""
         operator = group['operator'].upper()
         conditions = group['conditions']
 
-        if not conditions:
-            return False
-
-        results = [self._evaluate_condition(c, row, df, idx) for c in conditions]
+        if not conditions or operator not in ('AND', 'OR'):
+            return np.zeros(n_bars, dtype=bool)
 
-        if operator == 'AND':
-            return all(results)
-        elif operator == 'OR':
-            return any(results)
-        else:
-            return False
-
-    def _select_instrument(self, rule: Dict[str, Any], row: pd.Series) -> Dict[str, Any]:
-        expected_move = float(row.get('expected_move_pct', 2.0))
-        volatility = float(row.get('atr_value', 50) / row.get('close', 1) * 100)
+        # Stop once the mask can no longer change: all-False under AND, all-True under OR
+        mask = np.broadcast_to(self._evaluate_condition(conditions[0], arrays, prev_arrays), (n_bars,))
+        for condition in conditions[1:]:
+            if operator == 'AND':
+                if not mask.any():
+                    break
+                mask = mask & self._evaluate_condition(condition, arrays, prev_arrays)
+            else:
+                if mask.all():
+                    break
+                mask = mask | self._evaluate_condition(condition, arrays, prev_arrays)
+        return mask
 
+    def _select_instrument(self, rule: Dict[str, Any], expected_move: float,
+                           volatility: float) -> Tuple[str, Dict[str, Any]]:
+        """Instrument type and definition for a matched rule; unknown types fall back to 3D_5PCT"""
         rule_metadata = rule.get('instrument_selection', {})
         time_horizon = rule_metadata.get('time_horizon_days', 3)
 
@@ -590,83 +1024,128 @@ class PortfolioAwareDslExecutor:
         if 'instrument_type' in rule['action_on_true']:
             instrument_type = rule['action_on_true']['instrument_type']
 
-        return self.option_instruments.get_instrument(instrument_type)
+        if instrument_type not in self.option_instruments.INSTRUMENTS:
+            instrument_type = "3D_5PCT"
+        return instrument_type, self.option_instruments.get_instrument(instrument_type)
+
+    def _match_rules(self, df_with_indicators: Dict[str, pd.Series], n_bars: int) -> np.ndarray:
+        """Index of the first matching rule on each bar, -1 where none match"""
+        compiled = self._compiled
+        if not self._rules:
+            return np.full(n_bars, -1, dtype=np.intp)
+
+        if _match_rules_nb is not None:
+            values = np.empty((n_bars, len(compiled.columns)), dtype=np.float64)
+            for j, col in enumerate(compiled.columns):
+                if col in df_with_indicators:
+                    values[:, j] = df_with_indicators[col].to_numpy(dtype=np.float64)
+                else:
+                    values[:, j] = np.nan
+            return _match_rules_nb(values, compiled.consts, compiled.cond_table,
+                                   compiled.rule_starts, compiled.rule_modes)
+
+        # Pull every referenced column out of pandas once; rules are evaluated on whole arrays
+        arrays = {
+            col: df_with_indicators[col].to_numpy(dtype=np.float64)
+            for col in compiled.columns
+            if col in df_with_indicators
+        }
+
+        prev_arrays = {}
+        rule_idx = np.full(n_bars, -1, dtype=np.intp)
+        for r, rule in enumerate(self._rules):
+            mask = self._evaluate_condition_group(rule['conditions_group'], arrays, prev_arrays, n_bars)
+            rule_idx = np.where((rule_idx == -1) & mask, r, rule_idx)
+        return rule_idx
+
+    def _column_array(self, columns: Dict[str, pd.Series], column: str, default: float,
+                      n_bars: int) -> np.ndarray:
+        """Column as float64, or default on every bar when there is no such column"""
+        if column in columns:
+            return columns[column].to_numpy(dtype=np.float64)
+        return np.full(n_bars, default)
 
     def generate_signals(self, df: pd.DataFrame) -> List[EnhancedOptionsSignal]:
-        df = df.copy()
-        df.columns = [col.lower() for col in df.columns]
+        # Lowercase names map onto the caller's columns; the frame itself is not copied
+        n_bars = len(df)
+        columns = {col.lower(): df[col] for col in df.columns}
 
-        df_with_indicators = self._calculate_indicators(df)
+        df_with_indicators = self._calculate_indicators(columns, df.index)
+        rules = self._rules
 
-        signals = []
         default_action = self.dsl.get('default_action_on_no_match', {
             'signal_type': 'NEUTRAL',
             'strength': 0,
             'instrument_type': '3D_5PCT'
         })
 
-        for idx in range(len(df_with_indicators)):
-            row = df_with_indicators.iloc[idx]
-            # Use timestamp column if available, otherwise use index
-            if 'timestamp' in df_with_indicators.columns:
-                timestamp = pd.to_datetime(row['timestamp'])
-            else:
-                timestamp = pd.to_datetime(df_with_indicators.index[idx])
-            last_close = row.get('close', np.nan)
-
-            signal_generated = False
-
-            for rule in self.dsl.get('signal_rules', []):
-                conditions_group = rule['conditions_group']
-
-                if self._evaluate_condition_group(conditions_group, row, df_with_indicators, idx):
-                    action = rule['action_on_true']
-                    instrument = self._select_instrument(rule, row)
-
-                    inst_type = None
-                    for key, val in self.option_instruments.INSTRUMENTS.items():
-                        if val == instrument:
-                            inst_type = key
-                            break
-
-                    signals.append(EnhancedOptionsSignal(
-                        strategy_id=uuid.UUID(self.strategy_id),
-                        signal=action['strength'],
-                        instrument_type=inst_type or '3D_5PCT',
-                        profit_cap_pct=instrument['profit_cap_pct'],
-                        premium_cost_pct=instrument['premium_cost_pct'],
-                        duration_days=instrument['duration_days'],
-                        last_close=last_close,
-                        timestamp=timestamp,
-                        rule_triggered=rule['rule_name'],
-                        expected_move_pct=row.get('expected_move_pct', 2.0),
-                        volatility=row.get('atr_value', 50) / last_close * 100 if not pd.isna(last_close) else 2.0
-                    ))
-                    signal_generated = True
-                    break
+        rule_idx = self._match_rules(df_with_indicators, n_bars)
 
-            if not signal_generated:
-                default_instrument = self.option_instruments.get_instrument(
-                    default_action.get('instrument_type', '3D_5PCT')
-                )
+        # Use timestamp column if available, otherwise use index
+        if 'timestamp' in df_with_indicators:
+            timestamps = pd.to_datetime(df_with_indicators['timestamp'])
+        else:
+            timestamps = df.index
+            if not isinstance(timestamps, pd.DatetimeIndex):
+                timestamps = pd.to_datetime(timestamps)
+
+        last_close = self._column_array(df_with_indicators, 'close', np.nan, n_bars)
+        atr_value = self._column_array(df_with_indicators, 'atr_value', 50, n_bars)
+        expected_move = self._column_array(df_with_indicators, 'expected_move_pct', 2.0, n_bars)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            close_or_one = self._column_array(df_with_indicators, 'close', 1, n_bars)
+            selection_volatility = atr_value / close_or_one * 100
+            volatility = np.where(np.isnan(last_close), 2.0, atr_value / last_close * 100)
+
+        sid = uuid.UUID(self.strategy_id)
+        default_type = default_action.get('instrument_type', '3D_5PCT')
+        default_instrument = self.option_instruments.get_instrument(default_type)
+
+        signals = []
+        for i, timestamp in enumerate(timestamps):
+            r = rule_idx[i]
+            if r >= 0:
+                rule = rules[r]
+                action = rule['action_on_true']
+                inst_type, instrument = self._select_instrument(rule, float(expected_move[i]),
+                                                                float(selection_volatility[i]))
                 signals.append(EnhancedOptionsSignal(
-                    strategy_id=uuid.UUID(self.strategy_id),
+                    strategy_id=sid,
+                    signal=action['strength'],
+                    instrument_type=inst_type,
+                    profit_cap_pct=instrument['profit_cap_pct'],
+                    premium_cost_pct=instrument['premium_cost_pct'],
+                    duration_days=instrument['duration_days'],
+                    last_close=last_close[i],
+                    timestamp=timestamp,
+                    rule_triggered=rule['rule_name'],
+                    expected_move_pct=expected_move[i],
+                    volatility=volatility[i]
+                ))
+            else:
+                signals.append(EnhancedOptionsSignal(
+                    strategy_id=sid,
                     signal=default_action['strength'],
-                    instrument_type=default_action.get('instrument_type', '3D_5PCT'),
+                    instrument_type=default_type,
                     profit_cap_pct=default_instrument['profit_cap_pct'],
                     premium_cost_pct=default_instrument['premium_cost_pct'],
                     duration_days=default_instrument['duration_days'],
-                    last_close=last_close,
+                    last_close=last_close[i],
                     timestamp=timestamp,
                     rule_triggered='DEFAULT',
-                    expected_move_pct=row.get('expected_move_pct', 2.0),
-                    volatility=row.get('atr_value', 50) / last_close * 100 if not pd.isna(last_close) else 2.0
+                    expected_move_pct=expected_move[i],
+                    volatility=volatility[i]
                 ))
 
         return signals
 
 
 # ==================== ENHANCED BACKTESTER ====================
+def _running_total(values: np.ndarray) -> float:
+    """Sum added left to right like sum(), where ndarray.sum() would add pairwise; 0 when empty"""
+    return values.cumsum()[-1] if len(values) else 0
+
+
 class PortfolioBacktester:
     """Backtester with portfolio management"""
 
@@ -678,46 +1157,46 @@ class PortfolioBacktester:
         """Run backtest with portfolio management"""
         portfolio_manager = PortfolioManager(self.portfolio_config)
 
-        # Create signal lookup
-        signal_dict = {s.timestamp: s for s in signals}
+        # Bar times and closes are converted once; iterating a DatetimeIndex boxes all Timestamps in one pass
+        timestamps = pd.DatetimeIndex(pd.to_datetime(ohlcv_df.index)).as_unit('ns')
+        bar_ns = timestamps.asi8.tolist()
+        close_arr = ohlcv_df['close'].to_numpy(dtype=np.float64)
 
-        # Track additional metrics
-        capital_history = []
-        drawdown_history = []
-        positions_history = []
+        signal_by_bar = self._signal_lookup(signals, timestamps)
 
-        for idx in range(len(ohlcv_df)):
-            timestamp = pd.to_datetime(ohlcv_df.index[idx])
-            current_price = ohlcv_df.iloc[idx]['close']
+        # Per-bar portfolio state, written in place and turned into records once the run is done
+        n_bars = len(timestamps)
+        capital_hist = np.empty(n_bars, dtype=np.float64)
+        drawdown_hist = np.empty(n_bars, dtype=np.float64)
+        active_hist = np.empty(n_bars, dtype=np.intp)
 
-            # Check for position expiries
-            expired_positions = []
-            for pos in portfolio_manager.active_positions:
-                days_held = (timestamp - pos['entry_time']).days
-                if days_held >= pos['duration_days']:
-                    expired_positions.append(pos)
+        for idx, (timestamp, ts_ns, current_price) in enumerate(zip(timestamps, bar_ns, close_arr)):
 
-            # Close expired positions
-            for pos in expired_positions:
+            # Close positions that reached expiry
+            for pos in portfolio_manager.pop_expired(ts_ns):
                 portfolio_manager.close_position(pos, current_price, timestamp, "expiry")
 
             # Check for new signals
-            if timestamp in signal_dict:
-                signal = signal_dict[timestamp]
-
+            signal = signal_by_bar.get(idx)
+            if signal is not None:
                 if signal.signal != 0:
                     portfolio_manager.open_position(signal, current_price)
 
-            # Record portfolio state
-            capital_history.append({
-                'timestamp': timestamp,
-                'capital_eth': portfolio_manager.capital_eth,
-                'drawdown_pct': portfolio_manager.calculate_drawdown(),
-                'active_positions': len(portfolio_manager.active_positions)
-            })
+            # Record portfolio state; drawdown from peak as in PortfolioManager.calculate_drawdown
+            capital = portfolio_manager.capital_eth
+            peak = portfolio_manager.peak_capital
+            capital_hist[idx] = capital
+            drawdown_hist[idx] = ((peak - capital) / peak) * 100 if peak > 0 else 0
+            active_hist[idx] = len(portfolio_manager.active_positions)
+
+        capital_history = [
+            {'timestamp': timestamp, 'capital_eth': capital, 'drawdown_pct': drawdown, 'active_positions': active}
+            for timestamp, capital, drawdown, active in zip(
+                timestamps, capital_hist.tolist(), drawdown_hist.tolist(), active_hist.tolist())
+        ]
 
         # Calculate comprehensive statistics
-        stats = self._calculate_statistics(portfolio_manager, capital_history)
+        stats = self._calculate_statistics(portfolio_manager, drawdown_hist, active_hist)
 
         # Prepare detailed output
         return {
@@ -732,8 +1211,56 @@ class PortfolioBacktester:
             }
         }
 
+    @staticmethod
+    def _signal_lookup(signals: List[EnhancedOptionsSignal],
+                       timestamps: pd.DatetimeIndex) -> Dict[int, EnhancedOptionsSignal]:
+        """
+        Signals keyed by the position of the bar they fall on, the last one winning per timestamp.
+        Matching is on datetime64[ns] ticks; a tz-aware signal never matches naive bars (or the
+        reverse), as with Timestamp equality.
+        """
+        naive_bars = timestamps.tz is None
+        signal_dict = {}
+        for s in signals:
+            signal_ts = pd.Timestamp(s.timestamp)
+            if (signal_ts.tzinfo is None) == naive_bars:
+                signal_dict[signal_ts.value] = s
+        if not signal_dict:
+            return {}
+
+        signal_by_bar = {}
+        for idx, ts_ns in enumerate(timestamps.asi8.tolist()):
+            signal = signal_dict.get(ts_ns)
+            if signal is not None:
+                signal_by_bar[idx] = signal
+        return signal_by_bar
+
+    @staticmethod
+    def _trades_to_arrays(completed_trades: List[TradeLog]) -> Dict[str, np.ndarray]:
+        """Trade fields the statistics reduce over, one array per field in trade order"""
+        n = len(completed_trades)
+
+        def floats(name: str) -> np.ndarray:
+            return np.fromiter((getattr(t, name) for t in completed_trades), dtype=np.float64, count=n)
+
+        def times(name: str) -> np.ndarray:
+            ticks = (pd.Timestamp(getattr(t, name)).value for t in completed_trades)
+            return np.fromiter(ticks, dtype=np.int64, count=n).view('datetime64[ns]')
+
+        return {
+            'pnl_pct': floats('pnl_pct'),
+            'pnl_eth': floats('pnl_eth'),
+            'position_size_eth': floats('position_size_eth'),
+            'position_size_pct': floats('position_size_pct'),
+            'premium_cost_eth': floats('premium_cost_eth'),
+            'premium_cost_pct': floats('premium_cost_pct'),
+            'win': np.fromiter((bool(t.win) for t in completed_trades), dtype=bool, count=n),
+            'entry_time': times('entry_time'),
+            'exit_time': times('exit_time'),
+        }
+
     def _calculate_statistics(self, portfolio_manager: PortfolioManager,
-                             capital_history: List[Dict]) -> Dict[str, Any]:
+                             drawdown_hist: np.ndarray, active_hist: np.ndarray) -> Dict[str, Any]:
         """Calculate comprehensive statistics"""
         trade_logs = portfolio_manager.trade_logs
         completed_trades = [t for t in trade_logs if t.exit_time is not None]
@@ -741,39 +1268,41 @@ class PortfolioBacktester:
         if not completed_trades:
             return self._empty_statistics()
 
-        # Basic metrics
-        winning_trades = [t for t in completed_trades if t.win]
-        losing_trades = [t for t in completed_trades if not t.win]
+        trades = self._trades_to_arrays(completed_trades)
+        n_trades = len(completed_trades)
+        win_mask = trades['win']
+        n_winning = int(win_mask.sum())
+        n_losing = n_trades - n_winning
 
+        # Basic metrics
         total_return_eth = portfolio_manager.capital_eth - self.portfolio_config.initial_capital_eth
         total_return_pct = (total_return_eth / self.portfolio_config.initial_capital_eth) * 100
 
-        win_rate = len(winning_trades) / len(completed_trades) * 100 if completed_trades else 0
+        win_rate = n_winning / n_trades * 100
 
         # P&L metrics
-        avg_win_pct = np.mean([t.pnl_pct for t in winning_trades]) if winning_trades else 0
-        avg_loss_pct = np.mean([t.pnl_pct for t in losing_trades]) if losing_trades else 0
+        pnl_pct = trades['pnl_pct']
+        avg_win_pct = pnl_pct[win_mask].mean() if n_winning else 0
+        avg_loss_pct = pnl_pct[~win_mask].mean() if n_losing else 0
 
         # Time metrics
-        first_trade = min(completed_trades, key=lambda x: x.entry_time)
-        last_trade = max(completed_trades, key=lambda x: x.exit_time)
-        trading_days = (last_trade.exit_time - first_trade.entry_time).days
+        trading_days = int((trades['exit_time'].max() - trades['entry_time'].min()) // np.timedelta64(1, 'D'))
 
         # Capital efficiency
-        avg_positions = np.mean([h['active_positions'] for h in capital_history])
-        max_positions = max([h['active_positions'] for h in capital_history])
+        avg_positions = np.mean(active_hist)
+        max_positions = int(active_hist.max())
 
         # Position sizing metrics
-        avg_position_size_eth = np.mean([t.position_size_eth for t in completed_trades])
-        avg_position_size_pct = np.mean([t.position_size_pct for t in completed_trades])
+        avg_position_size_eth = trades['position_size_eth'].mean()
+        avg_position_size_pct = trades['position_size_pct'].mean()
 
         # Risk metrics
-        max_drawdown = max([h['drawdown_pct'] for h in capital_history])
+        max_drawdown = drawdown_hist.max()
 
         # Calculate Sharpe ratio
-        if len(completed_trades) > 1:
-            returns = [t.pnl_pct for t in completed_trades]
-            sharpe_ratio = (np.mean(returns) / np.std(returns)) * np.sqrt(252) if np.std(returns) > 0 else 0
+        if n_trades > 1:
+            std = pnl_pct.std()
+            sharpe_ratio = (pnl_pct.mean() / std) * np.sqrt(252) if std > 0 else 0
         else:
             sharpe_ratio = 0
 
@@ -792,9 +1321,9 @@ class PortfolioBacktester:
 
         return {
             # Basic metrics
-            'total_trades': len(completed_trades),
-            'winning_trades': len(winning_trades),
-            'losing_trades': len(losing_trades),
+            'total_trades': n_trades,
+            'winning_trades': n_winning,
+            'losing_trades': n_losing,
             'win_rate_pct': win_rate,
 
             # Return metrics
@@ -805,7 +1334,7 @@ class PortfolioBacktester:
             # P&L metrics
             'avg_win_pct': avg_win_pct,
             'avg_loss_pct': avg_loss_pct,
-            'profit_factor': abs(sum([t.pnl_eth for t in winning_trades]) / sum([t.pnl_eth for t in losing_trades])) if losing_trades else float('inf'),
+            'profit_factor': abs(_running_total(trades['pnl_eth'][win_mask]) / _running_total(trades['pnl_eth'][~win_mask])) if n_losing else float('inf'),
 
             # Risk metrics
             'max_drawdown_pct': max_drawdown,
@@ -824,11 +1353,11 @@ class PortfolioBacktester:
 
             # Time metrics
             'trading_days': trading_days,
-            'trades_per_day': len(completed_trades) / trading_days if trading_days > 0 else 0,
+            'trades_per_day': n_trades / trading_days if trading_days > 0 else 0,
 
             # Cost metrics
-            'total_premium_paid_eth': sum([t.premium_cost_eth for t in completed_trades]),
-            'avg_premium_cost_pct': np.mean([t.premium_cost_pct for t in completed_trades])
+            'total_premium_paid_eth': _running_total(trades['premium_cost_eth']),
+            'avg_premium_cost_pct': trades['premium_cost_pct'].mean()
         }
 
     def _empty_statistics(self) -> Dict[str, Any]:
@@ -860,6 +1389,53 @@ class PortfolioBacktester:
         }
 
 
+def run_parameter_sweep(signals: List[EnhancedOptionsSignal], ohlcv_df: pd.DataFrame,
+                        configs: List[PortfolioConfig]) -> List[Dict[str, Any]]:
+    """
+    Backtest the same signals under each config, keeping only the headline numbers: final capital,
+    closed trades and max per-bar drawdown. With numba the configs run in parallel without trade logs;
+    without it each config gets a full run_backtest.
+    """
+    if _sweep_portfolio_nb is None:
+        results = []
+        for config in configs:
+            run = PortfolioBacktester(config).run_backtest(signals, ohlcv_df)
+            history = run['capital_history']
+            results.append({
+                'final_capital_eth': history[-1]['capital_eth'] if history else config.initial_capital_eth,
+                'total_trades': sum(1 for t in run['trade_logs'] if t['exit_time'] is not None),
+                'max_drawdown_pct': max((h['drawdown_pct'] for h in history), default=0.0),
+            })
+        return results
+
+    timestamps = pd.DatetimeIndex(pd.to_datetime(ohlcv_df.index)).as_unit('ns')
+    close = ohlcv_df['close'].to_numpy(dtype=np.float64)
+    signal_by_bar = PortfolioBacktester._signal_lookup(signals, timestamps)
+    bar_signal = np.full(len(timestamps), -1, dtype=np.int64)
+    bar_signal[list(signal_by_bar)] = np.arange(len(signal_by_bar))
+
+    sig_list = list(signal_by_bar.values())
+    n_signals = len(sig_list)
+    sig_strength = np.array([s.signal for s in sig_list], dtype=np.int64)
+    sig_profit_cap = np.array([s.profit_cap_pct / 100 for s in sig_list], dtype=np.float64)
+    sig_premium = np.array([s.premium_cost_pct / 100 for s in sig_list], dtype=np.float64)
+    sig_duration_ns = np.array([s.duration_days * NS_PER_DAY for s in sig_list], dtype=np.int64)
+
+    multipliers = np.array([[c.position_multipliers.get(abs(s.signal), 1.0) for s in sig_list] for c in configs],
+                           dtype=np.float64).reshape(len(configs), n_signals)
+    params = np.array([[getattr(c, name) for name in SWEEP_PARAMS] for c in configs],
+                      dtype=np.float64).reshape(len(configs), len(SWEEP_PARAMS))
+    max_concurrent = np.array([c.max_concurrent_positions for c in configs], dtype=np.int64)
+
+    final_capital, n_trades, max_drawdown = _sweep_portfolio_nb(
+        timestamps.asi8, close, bar_signal, sig_strength, sig_profit_cap, sig_premium, sig_duration_ns,
+        multipliers, params, max_concurrent)
+    return [
+        {'final_capital_eth': capital, 'total_trades': trades, 'max_drawdown_pct': drawdown}
+        for capital, trades, drawdown in zip(final_capital.tolist(), n_trades.tolist(), max_drawdown.tolist())
+    ]
+
+
 # ==================== STRATEGY GENERATOR ====================
 def generate_test_strategy() -> Dict[str, Any]:
     """Generate a test strategy with portfolio management hints"""
@@ -974,6 +1550,28 @@ def generate_test_strategy() -> Dict[str, Any]:
     }
 
 
+def warmup_kernels(n_bars: int = 64) -> None:
+    """
+    Compile the numba kernels up front by generating the test strategy's signals on a small synthetic
+    frame, so the JIT compile is not paid by the first real signal generation
+    """
+    if njit is None:
+        return
+
+    steps = np.arange(n_bars, dtype=np.float64)
+    close = 100.0 + 5.0 * np.sin(steps / 4.0) + 0.1 * steps
+    df = pd.DataFrame({
+        'open': close - 0.5,
+        'high': close + 1.0,
+        'low': close - 1.0,
+        'close': close,
+        'volume': 1000.0 + steps,
+    }, index=pd.date_range('2024-01-01', periods=n_bars, freq='12h'))
+
+    executor = PortfolioAwareDslExecutor(generate_test_strategy()['strategy_logic_dsl'], str(uuid.uuid4()))
+    executor.generate_signals(df)
+
+
 # ==================== MAIN EXECUTION ====================
 def load_market_data(filepath: str) -> pd.DataFrame:
     """Load market data"""
@@ -1026,6 +1624,8 @@ def main():
         logger.error(f"Failed to load data: {e}")
         return
 
+    warmup_kernels()
+
     # Test different portfolio configurations
     configurations = [
         {
@@ -1129,4 +1729,6 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    # Run from the module as imported by name, so the kernel cache is shared with the scripts
+    import portfolio_enhanced_laa_eva
+    portfolio_enhanced_laa_eva.main()
\ No newline at end of file
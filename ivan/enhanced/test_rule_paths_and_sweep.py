@@ -0,0 +1,158 @@
+"""
+Check that the two rule evaluators and the parameter sweep agree with the reference backtest.
+
+With numba installed, PortfolioAwareDslExecutor matches rules in _match_rules_nb and
+run_parameter_sweep simulates configs in _sweep_portfolio_nb; without it both fall back to
+numpy/pandas. This script runs both rule paths on every bundled dataset and checks that the
+signals are identical, then checks run_parameter_sweep against a full run_backtest per config.
+Exits non-zero on any mismatch.
+"""
+
+import copy
+import logging
+import os
+import random
+import sys
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import portfolio_enhanced_laa_eva as pel
+from portfolio_enhanced_laa_eva import (
+    PortfolioAwareDslExecutor, PortfolioBacktester, PortfolioConfig,
+    generate_test_strategy, load_market_data, run_parameter_sweep
+)
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "data")
+STRATEGY_ID = "00000000-0000-4000-8000-000000000000"
+
+SERIES = ['close', 'open', 'rsi_value', 'macd_line', 'macd_signal', 'macd_hist',
+          'sma_short', 'sma_long', 'atr_value', 'no_such_column']
+OPERATORS = ['>', '<', '>=', '<=', '==', '!=', 'crosses_above', 'crosses_below']
+VALUES = [0, 30, 40, 50, 60, 70, '@rsi_oversold', '@rsi_overbought', '@atr_threshold']
+
+
+def get_strategies(n_random: int = 12):
+    """The test strategy plus seeded random rule sets over its indicator columns"""
+    base = generate_test_strategy()['strategy_logic_dsl']
+    strategies = [("test_strategy", base)]
+
+    rng = random.Random(0)
+    for i in range(n_random):
+        dsl = copy.deepcopy(base)
+        rules = []
+        for r in range(rng.randint(1, 4)):
+            conditions = [
+                {"series1": rng.choice(SERIES), "operator": rng.choice(OPERATORS),
+                 "series2_or_value": rng.choice(SERIES + VALUES)}
+                for _ in range(rng.randint(0, 3))
+            ]
+            rules.append({
+                "rule_name": f"random_{i}_{r}",
+                "conditions_group": {"operator": rng.choice(['AND', 'OR']), "conditions": conditions},
+                "action_on_true": {"signal_type": "CALL", "strength": rng.choice([-7, -3, 3, 7])},
+                "instrument_selection": {"time_horizon_days": rng.choice([3, 7]),
+                                         "volatility_threshold": "@high_vol_threshold"}
+            })
+        dsl['signal_rules'] = rules
+        strategies.append((f"random_{i}", dsl))
+    return strategies
+
+
+def get_configs(n_random: int = 40):
+    """The default config plus a seeded grid of random ones"""
+    rng = random.Random(1)
+    configs = [PortfolioConfig()]
+    for _ in range(n_random):
+        configs.append(PortfolioConfig(
+            initial_capital_eth=rng.choice([1.0, 3.5, 10.0]),
+            position_size_pct=rng.choice([1.0, 5.0, 20.0, 50.0, 90.0]),
+            max_concurrent_positions=rng.choice([1, 2, 5, 50]),
+            max_drawdown_pct=rng.choice([0.5, 2.0, 10.0, 50.0]),
+            recovery_threshold_pct=rng.choice([50.0, 75.0, 99.0]),
+            reserve_capital_pct=rng.choice([0.0, 20.0, 60.0]),
+            position_sizing_mode=rng.choice(['fixed', 'kelly']),
+            kelly_win_rate=rng.random(),
+            position_multipliers=rng.choice([{7: 1.5, 3: 1.0}, {7: 3.0, -7: 0.5, 3: 2.0, -3: 1.0}, {}])
+        ))
+    return configs
+
+
+def signal_key(signal):
+    """Comparable signal fields; floats go through repr so NaN compares equal to NaN"""
+    return (signal.signal, signal.instrument_type, signal.profit_cap_pct, signal.duration_days,
+            signal.rule_triggered, str(signal.timestamp), repr(float(signal.last_close)),
+            repr(float(signal.expected_move_pct)), repr(float(signal.volatility)))
+
+
+def generate_with_mask_path(dsl, df):
+    """Generate signals with the numpy mask evaluator, even when numba is installed"""
+    kernel = pel._match_rules_nb
+    pel._match_rules_nb = None
+    try:
+        return PortfolioAwareDslExecutor(dsl, STRATEGY_ID).generate_signals(df)
+    finally:
+        pel._match_rules_nb = kernel
+
+
+def reference_results(signals, df, configs):
+    """Headline numbers from a full run_backtest per config"""
+    results = []
+    for config in configs:
+        run = PortfolioBacktester(config).run_backtest(signals, df)
+        history = run['capital_history']
+        results.append({
+            'final_capital_eth': history[-1]['capital_eth'] if history else config.initial_capital_eth,
+            'total_trades': sum(1 for t in run['trade_logs'] if t['exit_time'] is not None),
+            'max_drawdown_pct': max((h['drawdown_pct'] for h in history), default=0.0),
+        })
+    return results
+
+
+def main():
+    print("🧪 Checking rule evaluators and parameter sweep")
+    print("=" * 50)
+    # Thousands of backtests run below; keep their per-trade log lines out of the output
+    logging.disable(logging.WARNING)
+    if pel._match_rules_nb is None:
+        print("ℹ️  numba not installed: both sides run the numpy/pandas path")
+
+    strategies = get_strategies()
+    configs = get_configs()
+    files = sorted(f for f in os.listdir(DATA_DIR) if f.startswith("eth_") and f.endswith(".json"))
+
+    rule_failures = 0
+    sweep_failures = 0
+    sweep_checks = 0
+    for filename in files:
+        df = load_market_data(os.path.join(DATA_DIR, filename))
+        file_rule_failures = 0
+        file_sweep_failures = 0
+
+        for name, dsl in strategies:
+            signals = PortfolioAwareDslExecutor(dsl, STRATEGY_ID).generate_signals(df)
+            mask_signals = generate_with_mask_path(dsl, df)
+            if [signal_key(s) for s in signals] != [signal_key(s) for s in mask_signals]:
+                file_rule_failures += 1
+                print(f"❌ {filename} {name}: rule paths disagree")
+
+            swept = run_parameter_sweep(signals, df, configs)
+            expected = reference_results(signals, df, configs)
+            for i, (got, want) in enumerate(zip(swept, expected)):
+                sweep_checks += 1
+                if got != want:
+                    file_sweep_failures += 1
+                    print(f"❌ {filename} {name} config {i}: sweep {got} != backtest {want}")
+
+        status = "✅" if not (file_rule_failures or file_sweep_failures) else "❌"
+        print(f"{status} {filename}: {len(strategies)} strategies, {len(configs)} configs")
+        rule_failures += file_rule_failures
+        sweep_failures += file_sweep_failures
+
+    print(f"\nRule paths: {rule_failures} mismatches over {len(files) * len(strategies)} runs")
+    print(f"Sweep: {sweep_failures} mismatches over {sweep_checks} config runs")
+    if rule_failures or sweep_failures:
+        sys.exit(1)
+    print("\n🎉 All paths agree!")
+
+
+if __name__ == "__main__":
+    main()